@@ -6,12 +6,17 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import streamlit as st
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 import time
 import json
 from datetime import datetime
 
+# Import the scraper
+import content_scraper
+from dedup_index import DedupIndex
+from article_bodies import fetch_article_bodies
+from feed_scraper import scrape_techcrunch_feed as scrape_feed, CATEGORY_FEEDS
+from image_cache import get_thumbnail_cache
+
 # Import the content generator
 from content_generator import ContentGenerator, save_generated_content, create_blog_pipeline
 
@@ -34,114 +39,65 @@ if "video_history" not in st.session_state:
 @st.cache_data(ttl=300)
 def scrape_techcrunch(search_term="technology", max_articles=10):
     try:
-        url = f"https://techcrunch.com/?s={search_term.replace(' ', '+')}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        articles = []
-        article_containers = soup.find_all("div", class_="loop-card__content")
-        if not article_containers:
-            article_containers = soup.find_all("article") or soup.find_all("div", class_="post-block")
-        for container in article_containers[:max_articles]:
-            article_data = extract_article_data(container)
-            if article_data["title"] and article_data["title"] != "No Title":
-                articles.append(article_data)
-        return articles
+        return content_scraper.scrape_techcrunch(search_term, max_articles, raise_errors=True)
     except Exception as e:
         st.error(f"Scraping error: {str(e)}")
         return []
 
-def extract_article_data(container):
-    article = {
-        "title": "No Title",
-        "link": "#",
-        "author": "",
-        "date": "",
-        "image": "",
-        "excerpt": ""
-    }
+@st.cache_data(ttl=300)
+def scrape_techcrunch_feed(search_term=None, max_articles=10, category=None):
     try:
-        title_selectors = [
-            "h3.loop-card__title",
-            "h2.loop-card__title", 
-            "h3",
-            "h2",
-            ".post-title",
-            ".entry-title"
-        ]
-        for selector in title_selectors:
-            title_element = container.select_one(selector)
-            if title_element:
-                article["title"] = title_element.get_text(strip=True)
-                break
-        link_element = container.find("a")
-        if link_element and "href" in link_element.attrs:
-            link = link_element["href"]
-            if link.startswith("/"):
-                link = "https://techcrunch.com" + link
-            article["link"] = link
-        author_selectors = [
-            "a.loop-card__author",
-            ".author",
-            ".byline",
-            "[class*='author']"
-        ]
-        for selector in author_selectors:
-            author_element = container.select_one(selector)
-            if author_element:
-                article["author"] = author_element.get_text(strip=True)
-                break
-        date_selectors = [
-            ".loop-card__meta",
-            ".post-date",
-            ".date",
-            "time",
-            "[class*='date']"
-        ]
-        for selector in date_selectors:
-            date_element = container.select_one(selector)
-            if date_element:
-                article["date"] = date_element.get_text(strip=True)
-                break
-        image_selectors = [
-            "figure.loop-card__figure img",
-            "img",
-            ".featured-image img"
-        ]
-        for selector in image_selectors:
-            img_element = container.select_one(selector)
-            if img_element and "src" in img_element.attrs:
-                article["image"] = img_element["src"]
-                break
-        if not article["image"]:
-            prev_element = container.find_previous("figure", class_="loop-card__figure")
-            if prev_element:
-                img = prev_element.find("img")
-                if img and "src" in img.attrs:
-                    article["image"] = img["src"]
-        excerpt_selectors = [
-            ".loop-card__excerpt",
-            ".excerpt",
-            ".post-excerpt",
-            "p"
-        ]
-        for selector in excerpt_selectors:
-            excerpt_element = container.select_one(selector)
-            if excerpt_element:
-                excerpt_text = excerpt_element.get_text(strip=True)
-                if len(excerpt_text) > 20:
-                    article["excerpt"] = excerpt_text[:200] + "..." if len(excerpt_text) > 200 else excerpt_text
-                    break
+        return scrape_feed(search_term, max_articles, category=category, raise_errors=True)
     except Exception as e:
-        pass
-    return article
+        st.error(f"Feed error: {str(e)}")
+        return []
+
+@st.cache_data(ttl=300)
+def search_sites(query, max_articles, site_names):
+    """Search every selected site in parallel, showing progress as each one answers"""
+    articles = []
+    progress = st.progress(0, text="Searching sites...")
+    status = st.empty()
+    for done, (name, site_articles, error) in enumerate(
+        content_scraper.search_sources(
+            query, max_articles, sources=list(site_names), dedup_index=DedupIndex(persistent=False)
+        ), start=1
+    ):
+        label = content_scraper.SOURCES[name].label
+        if error:
+            st.warning(f"{label}: {str(error)}")
+        articles.extend(site_articles)
+        progress.progress(done / len(site_names), text=f"{done}/{len(site_names)} sites answered")
+        status.caption(f"Latest: {label} ({len(site_articles)} articles)")
+    progress.empty()
+    return articles
+
+@st.cache_data(ttl=300)
+def scrape_categories(category_terms, max_articles=10):
+    """Scrape every category in parallel, showing progress as each one finishes"""
+    articles = []
+    progress = st.progress(0, text="Scraping categories...")
+    status = st.empty()
+    for done, (term, term_articles, error) in enumerate(
+        content_scraper.scrape_many(
+            category_terms.keys(), max_articles, dedup_index=DedupIndex(persistent=False)
+        ), start=1
+    ):
+        if error:
+            st.error(f"Scraping error for '{term}': {str(error)}")
+        for article in term_articles:
+            article["category"] = category_terms[term]
+        articles.extend(term_articles)
+        progress.progress(done / len(category_terms), text=f"Scraped {done}/{len(category_terms)} categories")
+        status.caption(f"Latest: {category_terms[term]} ({len(term_articles)} articles)")
+    progress.empty()
+    return articles
+
+@st.cache_data(ttl=300)
+def fetch_bodies(links):
+    """Full text fields per article link, cached so reruns don't download the pages again"""
+    articles = fetch_article_bodies([{"link": link} for link in links])
+    return {article.pop("link"): article for article in articles}
 
 def video_generation_module():
     st.header("AI Video Generation")
@@ -323,9 +279,19 @@ def content_expansion_module():
     st.header("Content Generation & Expansion")
     st.subheader("Powered by Google Gemini Pro API")
 
+    # Generator progress and errors are rendered with the matching Streamlit element
+    def show_generator_event(kind, message):
+        render = {
+            "heading": st.subheader,
+            "success": st.success,
+            "warning": st.warning,
+            "error": st.error,
+        }.get(kind, st.write)
+        render(message)
+
     @st.cache_resource
     def get_content_generator():
-        return ContentGenerator(GEMINI_API_KEY)
+        return ContentGenerator(GEMINI_API_KEY, on_event=show_generator_event)
     generator = get_content_generator()
 
     with st.sidebar:
@@ -355,40 +321,59 @@ def content_expansion_module():
                     "Writing Style:",
                     ["professional", "casual", "academic", "conversational", "technical"]
                 )
+                stream_output = st.checkbox("Stream output as it is written", value=True)
             submitted = st.form_submit_button("Generate Content")
         if submitted and topic:
-            with st.spinner("Generating content... This may take a few moments."):
-                content = generator.generate_expanded_content(
-                    topic=topic,
-                    content_type=content_type,
-                    target_length=target_length,
-                    style=style
-                )
+            if stream_output:
+                with st.expander("Generated Content", expanded=True):
+                    try:
+                        content = st.write_stream(generator.stream_expanded_content(
+                            topic=topic,
+                            content_type=content_type,
+                            target_length=target_length,
+                            style=style,
+                            raise_errors=True
+                        ))
+                    except Exception as e:
+                        # Keep the partial text on screen, but don't offer it for download or saving
+                        st.error(f"Error generating content: {str(e)}")
+                        content = None
+                if content:
+                    st.success(f"Generated {len(content.split())} words!")
+            else:
+                with st.spinner("Generating content... This may take a few moments."):
+                    content = generator.generate_expanded_content(
+                        topic=topic,
+                        content_type=content_type,
+                        target_length=target_length,
+                        style=style
+                    )
                 if content:
                     st.success(f"Generated {len(content.split())} words!")
                     with st.expander("Generated Content", expanded=True):
                         st.markdown(content)
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.download_button(
-                            "Download as Text",
-                            content,
-                            file_name=f"{topic[:30]}_content.txt",
-                            mime="text/plain"
-                        )
-                    with col2:
-                        if st.button("Save to Outputs"):
-                            content_data = {
-                                "topic": topic,
-                                "content_type": content_type,
-                                "style": style,
-                                "target_length": target_length,
-                                "content": content,
-                                "word_count": len(content.split()),
-                                "generated_at": datetime.now().isoformat()
-                            }
-                            filepath = save_generated_content(content_data)
-                            st.success(f"Content saved to: {filepath}")
+            if content:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.download_button(
+                        "Download as Text",
+                        content,
+                        file_name=f"{topic[:30]}_content.txt",
+                        mime="text/plain"
+                    )
+                with col2:
+                    if st.button("Save to Outputs"):
+                        content_data = {
+                            "topic": topic,
+                            "content_type": content_type,
+                            "style": style,
+                            "target_length": target_length,
+                            "content": content,
+                            "word_count": len(content.split()),
+                            "generated_at": datetime.now().isoformat()
+                        }
+                        filepath = save_generated_content(content_data)
+                        st.success(f"Content saved to: {filepath}")
 
     elif generation_mode == "Multiple Variations":
         st.subheader("Multiple Content Variations")
@@ -406,10 +391,17 @@ def content_expansion_module():
             submitted = st.form_submit_button("Generate Variations")
         if submitted and topic:
             with st.spinner(f"Generating {variation_count} variations..."):
+                variation_progress = st.progress(0, text="Waiting for the first variation...")
+
+                def show_variation_progress(done, total, variation):
+                    label = f"Variation {variation['variation']} ({variation['style']}) ready" if variation else "A variation failed"
+                    variation_progress.progress(done / total, text=f"{done}/{total} done - {label}")
+
                 variations = generator.generate_multiple_variations(
                     topic=topic,
                     count=variation_count,
-                    target_length=target_length
+                    target_length=target_length,
+                    progress_callback=show_variation_progress
                 )
                 if variations:
                     st.success(f"Generated {len(variations)} variations!")
@@ -456,28 +448,38 @@ def content_expansion_module():
             )
             submitted = st.form_submit_button("Enhance Content")
         if submitted and original_content:
-            with st.spinner("Enhancing content..."):
-                enhanced_content = generator.enhance_existing_content(
-                    original_content=original_content,
-                    enhancement_type=enhancement_type
+            # Stream the enhancement into a preview, then show the side-by-side comparison
+            preview = st.empty()
+            with preview.container():
+                st.caption("Enhancing content...")
+                try:
+                    enhanced_content = st.write_stream(generator.stream_enhanced_content(
+                        original_content=original_content,
+                        enhancement_type=enhancement_type,
+                        raise_errors=True
+                    ))
+                except Exception as e:
+                    st.error(f"Error enhancing content: {str(e)}")
+                    enhanced_content = None
+            if enhanced_content:
+                # On failure the partial preview stays up next to the error
+                preview.empty()
+                st.success("Content enhanced successfully!")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.subheader("Original Content")
+                    st.text_area("", original_content, height=300, disabled=True, key="original")
+                    st.caption(f"Word count: {len(original_content.split())}")
+                with col2:
+                    st.subheader("Enhanced Content")
+                    st.text_area("", enhanced_content, height=300, disabled=True, key="enhanced")
+                    st.caption(f"Word count: {len(enhanced_content.split())}")
+                st.download_button(
+                    "Download Enhanced Content",
+                    enhanced_content,
+                    file_name=f"enhanced_content_{enhancement_type}.txt",
+                    mime="text/plain"
                 )
-                if enhanced_content:
-                    st.success("Content enhanced successfully!")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.subheader("Original Content")
-                        st.text_area("", original_content, height=300, disabled=True, key="original")
-                        st.caption(f"Word count: {len(original_content.split())}")
-                    with col2:
-                        st.subheader("Enhanced Content")
-                        st.text_area("", enhanced_content, height=300, disabled=True, key="enhanced")
-                        st.caption(f"Word count: {len(enhanced_content.split())}")
-                    st.download_button(
-                        "Download Enhanced Content",
-                        enhanced_content,
-                        file_name=f"enhanced_content_{enhancement_type}.txt",
-                        mime="text/plain"
-                    )
 
     elif generation_mode == "Blog Pipeline":
         st.subheader("Complete Blog Creation Pipeline")
@@ -533,6 +535,27 @@ def content_expansion_module():
         - Complete blog pipeline
         **Output:** Up to 2000+ words per generation
         """)
+        if generator.cache is not None:
+            cache_stats = generator.cache.stats()
+            st.caption(
+                f"Response cache: {cache_stats['memory_hits'] + cache_stats['disk_hits']} hits / "
+                f"{cache_stats['misses']} misses ({cache_stats['disk_entries']} stored)"
+            )
+        if generator.semantic_cache is not None:
+            semantic_stats = generator.semantic_cache.stats()
+            st.caption(
+                f"Similar-topic cache: {semantic_stats['hits']} reused / "
+                f"{semantic_stats['misses']} misses ({semantic_stats['entries']} stored)"
+            )
+        if generator.resilience.breaker.state != "closed":
+            st.warning("Gemini API is failing; new requests are paused briefly before retrying.")
+        if generator.metrics is not None:
+            call_stats = generator.metrics.summary()
+            if call_stats:
+                with st.expander("Gemini call metrics"):
+                    st.dataframe(pd.DataFrame(call_stats), hide_index=True)
+                    total_cost = sum(row['cost_usd'] for row in call_stats)
+                    st.caption(f"Estimated cost this session: ${total_cost:.4f}")
 
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "Job Scraping", "Video Generation", "Text-to-Speech", "Media Output", "Content Expansion", "Project Info"
@@ -551,25 +574,74 @@ with tab1:
             "Cybersecurity": "cybersecurity",
             "Space Technology": "space technology",
             "Health Tech": "health technology",
+            "All Categories": "all",
             "Custom Search": "custom"
         }
         selected_category = st.selectbox("Choose Category:", list(search_categories.keys()))
     with col2:
-        max_articles = st.slider("Max Articles:", 5, 20, 10)
+        max_articles = st.slider("Max Articles:", 5, 50, 10)
     with col3:
         if st.button("Refresh", type="primary"):
             st.cache_data.clear()
     if search_categories[selected_category] == "custom":
         user_query = st.text_input("Enter custom search term:", placeholder="e.g., blockchain, fintech")
         search_term = user_query if user_query else "technology"
+    elif search_categories[selected_category] == "all":
+        search_term = "all categories"
+        st.info("Searching all categories in parallel")
     else:
         search_term = search_categories[selected_category]
         st.info(f"Searching for: **{search_term}**")
-    if search_term:
+    source = st.radio(
+        "Source:", ["Search Page", "RSS Feed"], horizontal=True,
+        help="RSS feeds are lighter to fetch and parse; the search page covers older articles"
+    )
+    site_labels = {name: src.label for name, src in content_scraper.SOURCES.items() if name != "techcrunch_rss"}
+    sites = st.multiselect(
+        "Sites:", list(site_labels), default=["techcrunch"], format_func=lambda name: site_labels[name]
+    )
+    default_articles = None
+    fetch_full_text = st.checkbox("Fetch full article text", value=False, help="Download each article page and include its text in the CSV export")
+    if search_term and sites and sites != ["techcrunch"]:
+        # Fan out across every selected site and render as each one answers
+        query = "technology" if search_categories[selected_category] == "all" else search_term
+        site_names = tuple("techcrunch_rss" if name == "techcrunch" and source == "RSS Feed" else name for name in sites)
+        default_articles = search_sites(query, max_articles, site_names)
+    elif search_term and source == "RSS Feed":
+        feed_category = CATEGORY_FEEDS.get(selected_category)
+        if search_categories[selected_category] == "all":
+            # The main feed already spans every category
+            feed_term = None
+        else:
+            feed_term = None if feed_category else search_term
+        with st.spinner("Reading TechCrunch feed..."):
+            default_articles = DedupIndex(persistent=False).filter(
+                scrape_techcrunch_feed(feed_term, max_articles, feed_category)
+            )
+    elif search_term and search_categories[selected_category] == "all":
+        category_terms = {
+            term: name for name, term in search_categories.items() if term not in ("all", "custom")
+        }
+        default_articles = scrape_categories(category_terms, max_articles)
+    elif search_term:
         with st.spinner(f"Scraping TechCrunch for '{search_term}'..."):
-            default_articles = scrape_techcrunch(search_term, max_articles)
+            default_articles = DedupIndex(persistent=False).filter(scrape_techcrunch(search_term, max_articles))
+    else:
+        st.info("Please select a category or enter a search term to start scraping!")
+    if default_articles is not None:
+        if default_articles and fetch_full_text:
+            with st.spinner(f"Fetching full text for {len(default_articles)} articles..."):
+                bodies = fetch_bodies(tuple(article["link"] for article in default_articles))
+            for article in default_articles:
+                article.update(bodies.get(article["link"], {}))
         if default_articles:
             st.success(f"Found {len(default_articles)} articles")
+            parse_stats = content_scraper.get_parse_stats()
+            if parse_stats["pages"]:
+                st.caption(
+                    f"Parser: {parse_stats['backend']} | last page {parse_stats['last_parse_ms']} ms | "
+                    f"avg {parse_stats['avg_parse_ms']} ms over {parse_stats['pages']} pages"
+                )
             st.subheader(f"Latest Articles - {selected_category}")
             df_articles = pd.DataFrame(default_articles)
             view_mode = st.radio("View Mode:", ["Table View", "Card View"], horizontal=True)
@@ -578,13 +650,17 @@ with tab1:
                 display_df.columns = ['Title', 'Author', 'Date', 'Excerpt']
                 st.dataframe(display_df, use_container_width=True, height=400)
             else:
+                # Thumbnails are fetched once, resized and served from the local cache
+                thumbnails = get_thumbnail_cache().thumbnails([a["image"] for a in default_articles])
                 for i, article in enumerate(default_articles):
                     with st.container():
                         col_img, col_content = st.columns([1, 3])
                         with col_img:
-                            if article["image"]:
+                            # Images that could not be thumbnailed (e.g. SVG) are shown from the original URL
+                            thumbnail = thumbnails.get(article["image"]) or article["image"]
+                            if thumbnail:
                                 try:
-                                    st.image(article["image"], use_container_width=True)
+                                    st.image(thumbnail, use_container_width=True)
                                 except:
                                     st.write("No image")
                             else:
@@ -617,8 +693,6 @@ with tab1:
         else:
             st.warning(f"No articles found for '{search_term}'. Try a different search term.")
             st.info("**Suggestions:** Try broader terms like 'AI', 'startup', 'tech'")
-    else:
-        st.info("Please select a category or enter a search term to start scraping!")
 
 with tab2:
     video_generation_module()
@@ -0,0 +1,143 @@
+import codecs
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from content_scraper import get_session
+from extraction_plan import resolve_parser_backend
+from rate_limiter import HostRateLimiter
+
+# Body pages are read in chunks and cut off after this many bytes
+MAX_BODY_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Concurrent body downloads, overall and per host
+MAX_WORKERS = 16
+PER_HOST_LIMIT = 16
+# Token bucket per host: sustained requests/sec and burst size
+REQUESTS_PER_SECOND = 20
+BURST = 20
+
+# Where the article text lives, most specific first
+BODY_SELECTORS = [
+    "div.entry-content",
+    "div.wp-block-post-content",
+    "div.article-content",
+    "article",
+    "main"
+]
+
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+def _host_slot(url):
+    host = urlparse(url).netloc
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_slots[host]
+
+def download_html(url, max_bytes=MAX_BODY_BYTES, timeout=15):
+    """
+    Stream a page and decode it incrementally, stopping at max_bytes
+
+    Returns (html, truncated).
+    """
+    with _host_slot(url):
+        response = get_session().get(url, stream=True, timeout=timeout)
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if "html" not in content_type and "xml" not in content_type:
+                raise ValueError(f"Not an HTML page: {content_type or 'unknown content type'}")
+
+            encoding = response.encoding if "charset" in content_type.lower() else "utf-8"
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+            parts = []
+            received = 0
+            truncated = False
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if received + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - received]
+                    truncated = True
+                received += len(chunk)
+                parts.append(decoder.decode(chunk))
+                if truncated:
+                    break
+            parts.append(decoder.decode(b"", final=True))
+        finally:
+            response.close()
+    return "".join(parts), truncated
+
+def extract_main_text(html, backend=None):
+    """
+    Extract the readable article text from a full article page
+    """
+    soup = BeautifulSoup(html, resolve_parser_backend(backend))
+    for tag in soup(["script", "style", "noscript", "aside", "nav", "form"]):
+        tag.decompose()
+
+    root = None
+    for selector in BODY_SELECTORS:
+        root = soup.select_one(selector)
+        if root:
+            break
+    root = root or soup.body or soup
+
+    blocks = []
+    for element in root.find_all(["h2", "h3", "p", "li"]):
+        # Skip list items that only wrap paragraphs already collected
+        if element.name == "li" and element.find("p"):
+            continue
+        text = element.get_text(" ", strip=True)
+        if text:
+            blocks.append(text)
+    return "\n\n".join(blocks)
+
+def iter_article_bodies(articles, max_workers=MAX_WORKERS, limiter=None, max_bytes=MAX_BODY_BYTES, timeout=15):
+    """
+    Download and extract full text for articles concurrently
+
+    Each article dict gets "body" and "body_words" keys (plus "body_error" on
+    failure, or "body_truncated" when the page hit max_bytes). Articles are
+    yielded as they finish. Requests are throttled by a per-host token bucket.
+    """
+    limiter = limiter or HostRateLimiter(REQUESTS_PER_SECOND, BURST)
+    targets = [a for a in articles if a.get("link", "#").startswith("http")]
+    if not targets:
+        return
+
+    def fetch(article):
+        try:
+            limiter.acquire(article["link"])
+            html, truncated = download_html(article["link"], max_bytes, timeout)
+            article["body"] = extract_main_text(html)
+            article["body_words"] = len(article["body"].split())
+            if truncated:
+                article["body_truncated"] = True
+        except Exception as e:
+            article["body"] = ""
+            article["body_words"] = 0
+            article["body_error"] = str(e)
+        return article
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(targets))) as executor:
+        futures = [executor.submit(fetch, article) for article in targets]
+        for future in as_completed(futures):
+            yield future.result()
+
+def fetch_article_bodies(articles, **kwargs):
+    """
+    Fill in full article text for a list from scrape_techcrunch
+
+    Returns the same list, with bodies written into each article dict.
+    """
+    for _ in iter_article_bodies(articles, **kwargs):
+        pass
+    return articles
@@ -0,0 +1,237 @@
+"""
+Bulk topic batch runner
+
+Reads topics from a CSV (with a "topic" column) or JSONL file and generates
+content for each with a bounded worker pool. Results are appended to a JSONL
+output file as they complete, and every finished item is recorded in a
+checkpoint file next to it, so an interrupted run picks up where it left off
+when started again with the same arguments.
+
+Optional per-item fields (CSV columns or JSON keys): id, mode ("expanded" or
+"blog"), content_type, target_length, style.
+
+Usage:
+    python batch_runner.py topics.csv
+    python batch_runner.py topics.jsonl --output outputs/batch.jsonl --workers 4 --mode blog
+"""
+import os
+import csv
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from content_generator import ContentGenerator, create_blog_pipeline
+from config import get_gemini_api_key
+from llm_backends import HTTPBackend
+
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 2
+# Seconds before the first retry; doubles with each attempt
+RETRY_BACKOFF = 2.0
+
+def read_items(path):
+    """Yield topic dicts from a CSV or JSONL file, skipping rows without a topic"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            if isinstance(row, str):
+                row = {"topic": row}
+            if (row.get("topic") or "").strip():
+                yield row
+
+def item_id(item, mode):
+    """Stable id for an item: its "id" field, or a hash of its settings"""
+    if item.get("id"):
+        return str(item["id"])
+    fields = {key: str(item.get(key, "")) for key in ("topic", "content_type", "target_length", "style")}
+    fields["mode"] = item.get("mode") or mode
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def load_checkpoint(path):
+    """Return the ids recorded as done in a checkpoint file"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash
+                continue
+            if entry.get("status") == "done":
+                done.add(entry["id"])
+    return done
+
+class BatchWriter:
+    """Appends output and checkpoint lines, flushed to disk after every item"""
+
+    def __init__(self, output_path, checkpoint_path):
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        self._output = open(output_path, "a", encoding="utf-8")
+        self._checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _append(f, record):
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    def write(self, result, checkpoint):
+        with self._lock:
+            # Output first: a crash in between repeats the item rather than losing it
+            if result is not None:
+                self._append(self._output, result)
+            self._append(self._checkpoint, checkpoint)
+
+    def close(self):
+        self._output.close()
+        self._checkpoint.close()
+
+def generate_item(generator, item, mode):
+    """Generate content for one item, raising on failure"""
+    topic = item["topic"].strip()
+    mode = item.get("mode") or mode
+    if mode == "blog":
+        package = create_blog_pipeline(topic, generator)
+        if package is None:
+            raise RuntimeError("Blog pipeline returned no content")
+        return package
+
+    content_type = item.get("content_type") or "blog"
+    target_length = int(item.get("target_length") or 2000)
+    style = item.get("style") or "professional"
+    content = generator.generate_expanded_content(topic, content_type, target_length, style, raise_errors=True)
+    return {
+        "topic": topic,
+        "content_type": content_type,
+        "style": style,
+        "content": content,
+        "word_count": len(content.split()),
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+def run_batch(items, generator, output_path, checkpoint_path=None, mode="expanded",
+              workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES):
+    """
+    Process items with a bounded worker pool, resuming from the checkpoint
+
+    Args:
+        items (iterable): Topic dicts, read lazily
+        generator (ContentGenerator): Shared generator (its rate limiter bounds request rate)
+        output_path (str): JSONL file that results are appended to
+        checkpoint_path (str): Checkpoint file (defaults to output_path + ".checkpoint")
+        mode (str): "expanded" or "blog" for items that don't set their own
+        workers (int): Maximum items in progress at once
+        retries (int): Extra attempts per item before it is recorded as failed
+
+    Returns:
+        dict: Run statistics
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    done = load_checkpoint(checkpoint_path)
+    writer = BatchWriter(output_path, checkpoint_path)
+    stats = {"succeeded": 0, "failed": 0, "skipped": 0, "retries": 0}
+    stats_lock = threading.Lock()
+
+    def process(key, item):
+        start = time.perf_counter()
+        for attempt in range(retries + 1):
+            try:
+                result = generate_item(generator, item, mode)
+                break
+            except Exception as e:
+                if attempt == retries:
+                    writer.write(None, {"id": key, "status": "failed", "topic": item["topic"],
+                                        "attempts": attempt + 1, "error": str(e)})
+                    with stats_lock:
+                        stats["failed"] += 1
+                    print(f"❌ {item['topic']}: {str(e)}")
+                    return
+                with stats_lock:
+                    stats["retries"] += 1
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+        elapsed = time.perf_counter() - start
+        result["batch_id"] = key
+        writer.write(result, {"id": key, "status": "done", "topic": item["topic"],
+                              "attempts": attempt + 1, "elapsed": round(elapsed, 2)})
+        with stats_lock:
+            stats["succeeded"] += 1
+        print(f"✅ {item['topic']} ({elapsed:.1f}s)")
+
+    start = time.perf_counter()
+    pending = set()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for item in items:
+                key = item_id(item, mode)
+                if key in done:
+                    stats["skipped"] += 1
+                    continue
+                done.add(key)
+                # Keep the queue short so large inputs are read as workers free up
+                if len(pending) >= workers * 2:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                pending.add(executor.submit(process, key, item))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    processed = stats["succeeded"] + stats["failed"]
+    stats["elapsed"] = round(elapsed, 1)
+    stats["items_per_min"] = round(processed / elapsed * 60, 1) if elapsed and processed else 0.0
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate content for a list of topics")
+    parser.add_argument("input", help="CSV (with a 'topic' column) or JSONL topic list")
+    parser.add_argument("--output", help="JSONL output file (default: outputs/batch_<input name>.jsonl)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--mode", choices=["expanded", "blog"], default="expanded", help="Default generation mode")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent items")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per failed item")
+    parser.add_argument("--structured", action="store_true",
+                        help="Request blog meta and social posts in one structured call")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Send a duplicate request for calls slower than the recent p95 latency")
+    parser.add_argument("--api-key", default=None, help="Gemini API key (default: GEMINI_API_KEY)")
+    parser.add_argument("--backend-url", default=None,
+                        help="Use an HTTP model backend (e.g. benchmarks/fake_llm_server.py) instead of Gemini")
+    args = parser.parse_args()
+
+    backend = None
+    api_key = args.api_key
+    if args.backend_url:
+        backend = HTTPBackend(args.backend_url)
+    else:
+        if not api_key:
+            api_key = get_gemini_api_key()
+        if not api_key:
+            parser.error("Set GEMINI_API_KEY or pass --api-key")
+
+    name = os.path.splitext(os.path.basename(args.input))[0]
+    output = args.output or os.path.join("outputs", f"batch_{name}.jsonl")
+    generator = ContentGenerator(api_key, max_workers=args.workers, structured_outputs=args.structured,
+                                 hedge_requests=args.hedge, backend=backend)
+    stats = run_batch(read_items(args.input), generator, output, args.checkpoint,
+                      mode=args.mode, workers=args.workers, retries=args.retries)
+
+    print(
+        f"\nSucceeded: {stats['succeeded']}  Failed: {stats['failed']}  "
+        f"Skipped (already done): {stats['skipped']}  Retries: {stats['retries']}"
+    )
+    print(f"Elapsed: {stats['elapsed']}s  Throughput: {stats['items_per_min']} items/min")
+    print(f"Results: {output}")
+
+if __name__ == "__main__":
+    main()
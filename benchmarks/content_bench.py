@@ -0,0 +1,234 @@
+"""
+Offline ContentGenerator load benchmark
+
+Runs the generator against benchmarks/fake_llm_server.py (started in-process,
+or an already running one via --backend-url) and measures, per scenario and
+concurrency level:
+
+- variations: generate_multiple_variations, one call at a time, with the
+  generator's worker pool set to the concurrency level
+- blog: create_blog_pipeline, that many pipelines in parallel
+- batch: batch_runner.run_batch with that many workers
+
+For each run it reports operations/sec, model requests/sec, output
+tokens/sec, operation latency p50/p95/p99, per-call latency percentiles
+(from LLMMetrics), retries and peak memory (tracemalloc peak of Python
+allocations, and process max RSS). Response caches are disabled so every
+call reaches the server. Results are printed and saved as JSON under
+benchmarks/results.
+
+Usage:
+    python benchmarks/content_bench.py
+    python benchmarks/content_bench.py --scenarios blog --concurrency 1 8 32 --ops 40
+    python benchmarks/content_bench.py --ttft pareto:200:1.5 --error-rate 0.05 --max-concurrency 8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import contextlib
+import tracemalloc
+import urllib.request
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, ROOT)
+
+# Every call must reach the stand-in server, and nothing is written to the real caches
+os.environ["LLM_CACHE"] = "0"
+os.environ["SEMANTIC_CACHE"] = "0"
+
+from content_generator import ContentGenerator, create_blog_pipeline
+from batch_runner import run_batch
+from llm_backends import HTTPBackend
+from llm_metrics import LLMMetrics
+from fake_llm_server import start_server, add_config_arguments, config_from_args
+
+SCENARIOS = ("variations", "blog", "batch")
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 1)
+
+def server_stats(url):
+    with urllib.request.urlopen(f"{url}/stats", timeout=10) as response:
+        return json.loads(response.read())
+
+def make_generator(url, concurrency, args, events):
+    return ContentGenerator(
+        backend=HTTPBackend(url),
+        requests_per_minute=args.rpm,
+        tokens_per_minute=None,
+        max_workers=concurrency,
+        cache=None,
+        semantic_cache=None,
+        metrics=LLMMetrics(),
+        structured_outputs=args.structured,
+        max_retries=args.max_retries,
+        hedge_requests=args.hedge,
+        on_event=lambda kind, message: events.append((kind, message)),
+    )
+
+def timed(func, *func_args):
+    start = time.perf_counter()
+    result = func(*func_args)
+    return result, (time.perf_counter() - start) * 1000
+
+def drive(generator, scenario, concurrency, args):
+    """Run one scenario; returns (per-operation latencies in ms, failed operations)"""
+    topics = [f"Benchmark topic {i}: applied machine learning in industry {i % 7}" for i in range(args.ops)]
+
+    if scenario == "variations":
+        results = [timed(generator.generate_multiple_variations, topic, args.variations, args.length)
+                   for topic in topics]
+        return [ms for _, ms in results], sum(1 for result, _ in results if len(result) < args.variations)
+
+    if scenario == "blog":
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda topic: timed(create_blog_pipeline, topic, generator), topics))
+        return [ms for _, ms in results], sum(1 for result, _ in results if result is None)
+
+    items = [{"topic": topic, "target_length": args.length} for topic in topics]
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:
+        output = os.path.join(directory, "batch.jsonl")
+        with contextlib.redirect_stdout(devnull):
+            stats = run_batch(items, generator, output, workers=concurrency, retries=args.batch_retries)
+        latencies = []
+        with open(f"{output}.checkpoint", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("status") == "done":
+                    latencies.append(record["elapsed"] * 1000)
+    return latencies, stats["failed"]
+
+def run_scenario(url, scenario, concurrency, args):
+    events = []
+    generator = make_generator(url, concurrency, args, events)
+    before = server_stats(url)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    latencies, failed = drive(generator, scenario, concurrency, args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    after = server_stats(url)
+    calls = generator.metrics.summary()
+    call_latencies = [row for row in calls if row["calls"] > row["errors"]]
+    requests = after["requests"] - before["requests"]
+    output_tokens = sum(row["output_tokens"] for row in calls)
+    resilience = generator.resilience.stats()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "ops": args.ops,
+        "failed_ops": failed,
+        "elapsed_s": round(elapsed, 2),
+        "ops_per_sec": round(args.ops / elapsed, 2),
+        "requests_per_sec": round(requests / elapsed, 1),
+        "output_tokens_per_sec": round(output_tokens / elapsed),
+        "op_p50_ms": percentile(latencies, 50),
+        "op_p95_ms": percentile(latencies, 95),
+        "op_p99_ms": percentile(latencies, 99),
+        # Slowest call kind at each percentile, from the generator's own metrics
+        "call_p50_ms": max((row["p50_ms"] for row in call_latencies), default=None),
+        "call_p95_ms": max((row["p95_ms"] for row in call_latencies), default=None),
+        "call_p99_ms": max((row["p99_ms"] for row in call_latencies), default=None),
+        "requests": requests,
+        "server_errors": (after["errors"] - before["errors"]) + (after["rate_limited"] - before["rate_limited"]),
+        "retries": resilience["retries"],
+        "hedges": resilience["hedges"],
+        "error_events": sum(1 for kind, _ in events if kind == "error"),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        "calls": calls,
+    }
+
+def run(args, server_config=None):
+    server = None
+    url = args.backend_url
+    if url is None:
+        server = start_server(server_config)
+        url = server.url
+
+    results = []
+    try:
+        config = server_stats(url)["config"]
+        for scenario in args.scenarios:
+            for concurrency in args.concurrency:
+                row = run_scenario(url, scenario, concurrency, args)
+                results.append(row)
+                # Percentiles are None when every operation failed
+                p50, p95, p99 = (str(row[f"op_{p}_ms"]) for p in ("p50", "p95", "p99"))
+                print(
+                    f"{scenario:<11} c={concurrency:<4} {row['ops_per_sec']:>8} ops/s "
+                    f"{row['requests_per_sec']:>8} req/s {row['output_tokens_per_sec']:>8} tok/s "
+                    f"p50 {p50:>9} ms  p95 {p95:>9} ms  p99 {p99:>9} ms "
+                    f"{row['failed_ops']:>3} failed {row['retries']:>4} retries {row['peak_memory_kb']:>9} KB peak"
+                )
+    finally:
+        if server:
+            server.shutdown()
+
+    return {
+        "run_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": config,
+        "settings": {
+            "ops": args.ops,
+            "length": args.length,
+            "variations": args.variations,
+            "structured": args.structured,
+            "hedge": args.hedge,
+            "rpm": args.rpm,
+        },
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ContentGenerator load benchmark")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16], help="Concurrency levels")
+    parser.add_argument("--ops", type=int, default=12, help="Operations per scenario and concurrency level")
+    parser.add_argument("--length", type=int, default=800, help="Target words for variations and batch items")
+    parser.add_argument("--variations", type=int, default=3, help="Variations per generate_multiple_variations call")
+    parser.add_argument("--structured", action="store_true", help="Use structured (JSON-schema) multi-output calls")
+    parser.add_argument("--hedge", action="store_true", help="Enable hedged requests")
+    parser.add_argument("--max-retries", type=int, default=3, help="Generator retries for transient errors")
+    parser.add_argument("--batch-retries", type=int, default=0, help="Item-level retries in batch runs")
+    parser.add_argument("--rpm", type=int, default=None, help="Apply a requests-per-minute quota (default: none)")
+    parser.add_argument("--backend-url", help="Use an already running fake_llm_server instead of starting one")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/content_<timestamp>.json)")
+    add_config_arguments(parser)
+    # Faster than a real model by default, so a full run takes a couple of minutes
+    parser.set_defaults(ttft="lognormal:300:0.5", tokens_per_sec=3000.0)
+    args = parser.parse_args()
+
+    try:
+        server_config = config_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+    report = run(args, server_config)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"content_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {output}")
+
+if __name__ == "__main__":
+    main()
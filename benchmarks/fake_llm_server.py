@@ -0,0 +1,280 @@
+"""
+Local stand-in for the Gemini API
+
+Serves the llm_backends.HTTPBackend protocol with synthetic responses, so
+ContentGenerator can be load-tested without API quota. Each request waits
+for a sampled time to first token, then "generates" output at a fixed token
+rate (streamed requests receive chunks as they are produced). Responses are
+shaped by the prompt: the requested word count is honoured, JSON-schema
+requests get schema-conforming JSON and outline prompts get an outline.
+
+Latency distributions:
+    const:MS  uniform:LO_MS:HI_MS  exp:MEAN_MS  lognormal:MEDIAN_MS:SIGMA
+    pareto:MIN_MS:ALPHA
+
+Usage:
+    python benchmarks/fake_llm_server.py --port 8765 --ttft lognormal:400:0.6 --tokens-per-sec 200
+    python content_cli.py expand "edge computing" --backend-url http://127.0.0.1:8765
+"""
+import re
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+import http.server
+
+TOKENS_PER_WORD = 1.3
+DEFAULT_OUTPUT_WORDS = 300
+STREAM_CHUNK_TOKENS = 40
+FILLER = (
+    "teams adopt practical systems that improve results while keeping costs predictable and "
+    "workflows simple so every stakeholder can measure progress against clear goals"
+).split()
+
+def parse_distribution(spec):
+    """Return a function sampling seconds from a spec like "lognormal:400:0.6" (times in ms)"""
+    name, *values = spec.split(":")
+    try:
+        values = [float(v) for v in values]
+    except ValueError:
+        values = None
+    if values and name == "const" and len(values) == 1:
+        return lambda: values[0] / 1000
+    if values and name == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1]) / 1000
+    if values and name == "exp" and len(values) == 1 and values[0] > 0:
+        return lambda: random.expovariate(1000 / values[0])
+    if values and name == "lognormal" and len(values) == 2 and values[0] > 0:
+        return lambda: random.lognormvariate(math.log(values[0] / 1000), values[1])
+    if values and name == "pareto" and len(values) == 2 and values[1] > 0:
+        return lambda: values[0] / 1000 * random.paretovariate(values[1])
+    raise ValueError(f"Invalid latency distribution '{spec}'")
+
+class ServerConfig:
+    """
+    Behaviour of the stand-in model
+
+    Args:
+        ttft (str): Time-to-first-token distribution spec
+        tokens_per_sec (float): Output rate after the first token
+        error_rate (float): Share of requests failing with 503
+        rate_limit_rate (float): Share of requests failing with 429
+        max_concurrency (int): Requests generated at once; others queue (None: unlimited)
+        length_factor (float): Output length relative to the word count the prompt asks for
+    """
+
+    def __init__(self, ttft="lognormal:400:0.5", tokens_per_sec=200.0, error_rate=0.0, rate_limit_rate=0.0,
+                 max_concurrency=None, length_factor=1.0, seed=None):
+        self.ttft_spec = ttft
+        self.sample_ttft = parse_distribution(ttft)
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrency = max_concurrency
+        self.length_factor = length_factor
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        if seed is not None:
+            random.seed(seed)
+
+    def describe(self):
+        return {
+            "ttft": self.ttft_spec,
+            "tokens_per_sec": self.tokens_per_sec,
+            "error_rate": self.error_rate,
+            "rate_limit_rate": self.rate_limit_rate,
+            "max_concurrency": self.max_concurrency,
+            "length_factor": self.length_factor,
+        }
+
+def requested_words(prompt):
+    """Word count a prompt asks for ("approximately 2000 words", "2000-word article"), or None"""
+    match = re.search(r"(?:approximately|about)\s+(\d+)(?:-\d+)?\s+words|(\d+)-word", prompt)
+    if not match:
+        return None
+    return int(match.group(1) or match.group(2))
+
+def sentence(words):
+    return " ".join(random.choice(FILLER) for _ in range(max(1, words))).capitalize() + "."
+
+def filler_text(words):
+    """Markdown with headings and paragraphs totalling about words words"""
+    paragraphs = [sentence(min(60, words - i)) for i in range(0, max(1, words), 60)]
+    sections = [f"## Section {i // 3 + 1}\n\n" + "\n\n".join(paragraphs[i:i + 3]) for i in range(0, len(paragraphs), 3)]
+    return "# Generated Article\n\n" + "\n\n".join(sections)
+
+def fake_json(schema, item_words, count, in_array=False, position=0):
+    """
+    A value matching a (Gemini-style) JSON schema
+
+    Strings inside arrays (e.g. variations) get item_words words; other
+    strings (meta descriptions, social posts) about 25. Arrays get count items.
+    """
+    kind = schema.get("type", "string").lower()
+    if kind == "object":
+        return {name: fake_json(field, item_words, count, in_array, position)
+                for name, field in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [fake_json(schema.get("items", {}), item_words, count, True, i) for i in range(count)]
+    if kind == "integer":
+        return position + 1
+    if kind == "number":
+        return float(position + 1)
+    if kind == "boolean":
+        return True
+    return filler_text(item_words) if in_array else sentence(25)
+
+def respond(prompt, generation_config, length_factor=1.0):
+    """Response text for a prompt: schema-conforming JSON, an outline, or markdown of the requested length"""
+    words = max(1, int((requested_words(prompt) or DEFAULT_OUTPUT_WORDS) * length_factor))
+    schema = (generation_config or {}).get("response_schema")
+    if schema:
+        count = re.search(r"Create\s+(\d+)\s", prompt)
+        return json.dumps(fake_json(schema, words, int(count.group(1)) if count else 3))
+
+    sections = re.search(r"(\d+) sections", prompt)
+    if sections and "Respond with JSON only" in prompt:
+        count = int(sections.group(1))
+        return json.dumps({
+            "title": "Generated Article",
+            "sections": [{"heading": f"Section {i + 1}", "points": ["First point", "Second point"],
+                          "words": words // count} for i in range(count)],
+        })
+    return filler_text(words)
+
+def token_count(text):
+    return max(1, int(len(text.split()) * TOKENS_PER_WORD))
+
+class FakeModelHandler(http.server.BaseHTTPRequestHandler):
+    config = ServerConfig()
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0, "in_flight": 0, "max_in_flight": 0}
+    stats_lock = threading.Lock()
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _count(self, field, delta=1):
+        with self.stats_lock:
+            self.stats[field] += delta
+            if field == "in_flight":
+                self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.stats_lock:
+                self._send_json(200, dict(self.stats, config=self.config.describe()))
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/v1/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self._count("requests")
+        config = self.config
+
+        roll = random.random()
+        if roll < config.rate_limit_rate:
+            self._count("rate_limited")
+            self._send_json(429, {"error": "Resource exhausted (simulated)"})
+            return
+        if roll < config.rate_limit_rate + config.error_rate:
+            self._count("errors")
+            time.sleep(config.sample_ttft())
+            self._send_json(503, {"error": "Service unavailable (simulated)"})
+            return
+
+        if config.slots:
+            config.slots.acquire()
+        self._count("in_flight")
+        try:
+            self._generate(request, config)
+        finally:
+            self._count("in_flight", -1)
+            if config.slots:
+                config.slots.release()
+
+    def _generate(self, request, config):
+        prompt = request.get("prompt", "")
+        text = respond(prompt, request.get("generation_config"), config.length_factor)
+        usage = {"prompt_token_count": token_count(prompt), "candidates_token_count": token_count(text)}
+        time.sleep(config.sample_ttft())
+        seconds_per_token = 1 / config.tokens_per_sec if config.tokens_per_sec else 0.0
+
+        if not request.get("stream"):
+            time.sleep(usage["candidates_token_count"] * seconds_per_token)
+            self._send_json(200, {"text": text, "usage": usage})
+            return
+
+        # No Content-Length: the stream ends when the connection closes
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = text.split(" ")
+        step = max(1, int(STREAM_CHUNK_TOKENS / TOKENS_PER_WORD))
+        for i in range(0, len(words), step):
+            piece = " ".join(words[i:i + step]) + (" " if i + step < len(words) else "")
+            last = i + step >= len(words)
+            line = {"text": piece, "usage": usage if last else None}
+            self.wfile.write((json.dumps(line) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            if not last:
+                time.sleep(step * TOKENS_PER_WORD * seconds_per_token)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeModelServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+def start_server(config=None, port=0):
+    """Start the stand-in server on a background thread; returns the server (base URL in server.url)"""
+    FakeModelHandler.config = config or ServerConfig()
+    FakeModelHandler.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "in_flight": 0, "max_in_flight": 0}
+    server = FakeModelServer(("127.0.0.1", port), FakeModelHandler)
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def add_config_arguments(parser):
+    parser.add_argument("--ttft", default="lognormal:400:0.5", help="Time-to-first-token distribution (ms)")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0, help="Output tokens per second per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests failing with 429")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Requests served at once; others queue")
+    parser.add_argument("--length-factor", type=float, default=1.0, help="Output length vs. requested words")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+
+def config_from_args(args):
+    return ServerConfig(args.ttft, args.tokens_per_sec, args.error_rate, args.rate_limit_rate,
+                        args.max_concurrency, args.length_factor, args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in LLM server for offline load tests")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        config = config_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+    server = start_server(config, args.port)
+    print(f"Serving on {server.url} ({json.dumps(config.describe())})", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
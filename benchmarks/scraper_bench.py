@@ -0,0 +1,188 @@
+"""
+Offline scraper benchmark
+
+Replays HTML fixtures from benchmarks/fixtures through a local stand-in for
+techcrunch.com and measures, per fixture and parser backend:
+
+- articles/sec end to end through scrape_techcrunch (HTTP + parse)
+- parse ms/page for parse_search_results
+- peak Python memory while parsing (tracemalloc; lxml's C-side buffers
+  are not included)
+
+Results are printed and saved as JSON under benchmarks/results so runs can
+be compared over time.
+
+Usage:
+    python benchmarks/scraper_bench.py
+    python benchmarks/scraper_bench.py --repeat 50 --backends lxml html.parser
+    python benchmarks/scraper_bench.py --record "artificial intelligence"
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import threading
+import tracemalloc
+import http.server
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, ROOT)
+
+# Replayed pages must not be served from or written to the real cache
+os.environ["SCRAPER_CACHE"] = "0"
+
+import content_scraper
+from extraction_plan import PARSER_BACKENDS, resolve_parser_backend
+
+# Cards in the generated large page
+LARGE_PAGE_CARDS = 600
+
+def load_fixtures():
+    """Read every fixture, plus a large page built from the search fixture"""
+    fixtures = {}
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if filename.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+                fixtures[filename[:-5]] = f.read()
+
+    base = fixtures.get("techcrunch_search")
+    marker = "\n  <li class=\"wp-block-post "
+    if base and marker in base:
+        start = base.index(marker)
+        end = base.index("\n  </ul>", start)
+        cards = base[start:end]
+        copies = LARGE_PAGE_CARDS // cards.count(marker) + 1
+        fixtures["techcrunch_large"] = base[:start] + cards * copies + base[end:]
+    return fixtures
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """Serves /?s=<fixture name> from the loaded fixtures"""
+    protocol_version = "HTTP/1.1"
+    fixtures = {}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        name = parse_qs(parsed.query).get("s", [""])[0]
+        body = self.fixtures.get(name) if parsed.path == "/" else None
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(fixtures):
+    FixtureHandler.fixtures = fixtures
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def bench_parse(html, backend, repeat):
+    timings = []
+    articles = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        articles = content_scraper.parse_search_results(html, max_articles=None, backend=backend)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    content_scraper.parse_search_results(html, max_articles=None, backend=backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "articles_per_page": len(articles),
+        "parse_ms_median": round(statistics.median(timings), 3),
+        "parse_ms_p95": round(sorted(timings)[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+def bench_end_to_end(name, backend, repeat):
+    os.environ["SCRAPER_PARSER"] = backend
+    articles = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        articles += len(content_scraper.scrape_techcrunch(name, max_articles=10000, raise_errors=True))
+    elapsed = time.perf_counter() - start
+    return {
+        "articles_per_sec": round(articles / elapsed, 1) if elapsed else 0.0,
+        "pages_per_sec": round(repeat / elapsed, 1) if elapsed else 0.0,
+    }
+
+def run(backends, repeat):
+    fixtures = load_fixtures()
+    server = start_server(fixtures)
+    original_base_url = content_scraper.BASE_URL
+    content_scraper.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    results = []
+    try:
+        for name, html in fixtures.items():
+            for backend in backends:
+                row = {"fixture": name, "backend": backend, "page_kb": round(len(html.encode("utf-8")) / 1024, 1)}
+                row.update(bench_parse(html, backend, repeat))
+                row.update(bench_end_to_end(name, backend, repeat))
+                results.append(row)
+                print(
+                    f"{name:<24} {backend:<12} {row['page_kb']:>8} KB "
+                    f"{row['articles_per_page']:>5} art {row['parse_ms_median']:>9} ms/page "
+                    f"{row['articles_per_sec']:>9} art/s {row['peak_memory_kb']:>9} KB peak"
+                )
+    finally:
+        content_scraper.BASE_URL = original_base_url
+        server.shutdown()
+
+    return {
+        "run_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+def record(search_term):
+    """Save a live TechCrunch search page as a new fixture"""
+    html = content_scraper.fetch_page(content_scraper.search_url(search_term), use_cache=False)
+    filename = f"recorded_{'_'.join(search_term.lower().split())}.html"
+    with open(os.path.join(FIXTURES_DIR, filename), "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"Recorded {len(html)} bytes to benchmarks/fixtures/{filename}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per fixture and backend")
+    parser.add_argument("--backends", nargs="+", help="Parser backends to compare (default: all installed)")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/scraper_<timestamp>.json)")
+    parser.add_argument("--record", metavar="SEARCH_TERM", help="Record a live search page as a fixture and exit")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    backends = args.backends or [b for b in PARSER_BACKENDS if resolve_parser_backend(b) == b]
+    report = run(backends, args.repeat)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {output}")
+
+if __name__ == "__main__":
+    main()
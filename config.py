@@ -13,4 +13,7 @@ def get_tts_voice():
     return os.getenv('EDGE_TTS_VOICE', 'en-US-AriaNeural')
 
 def get_n8n_url():
-    return os.getenv('N8N_WEBHOOK_URL')
\ No newline at end of file
+    return os.getenv('N8N_WEBHOOK_URL')
+
+def get_gemini_api_key():
+    return os.getenv('GEMINI_API_KEY')
\ No newline at end of file
@@ -0,0 +1,196 @@
+"""
+Headless command-line and worker entry point for ContentGenerator
+
+Runs the generation core without Streamlit. Progress and errors go to
+stderr; results go to stdout, so the commands compose with pipes and many
+processes can run side by side.
+
+Usage:
+    python content_cli.py expand "AI in healthcare" --length 1500 --stream
+    python content_cli.py variations "remote work" --count 3 --json
+    python content_cli.py enhance draft.md --type improve > improved.md
+    python content_cli.py blog "edge computing" --json
+    python content_cli.py worker --workers 4 < jobs.jsonl > results.jsonl
+
+Worker jobs are JSON objects, one per line, with a "task" (expand,
+variations, enhance or blog) plus that task's fields, e.g.
+    {"id": "1", "task": "expand", "topic": "AI in healthcare", "target_length": 1500}
+    {"id": "2", "task": "enhance", "content": "...", "enhancement_type": "summarize"}
+Each produces one result line: {"id", "task", "ok", "result" or "error", "elapsed"}.
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from content_generator import ContentGenerator, create_blog_pipeline, print_event
+from llm_backends import HTTPBackend
+from config import get_gemini_api_key
+
+TASKS = ("expand", "variations", "enhance", "blog")
+
+def run_task(generator, job):
+    """
+    Run one job dict and return its result
+
+    expand and enhance return text, variations a list and blog a package
+    dict. Raises RuntimeError when the generator produced nothing.
+    """
+    task = job.get("task")
+    if task == "expand":
+        result = generator.generate_expanded_content(
+            topic=job["topic"],
+            content_type=job.get("content_type", "blog"),
+            target_length=int(job.get("target_length", 2000)),
+            style=job.get("style", "professional")
+        )
+    elif task == "variations":
+        result = generator.generate_multiple_variations(
+            topic=job["topic"],
+            count=int(job.get("count", 3)),
+            target_length=int(job.get("target_length", 2000))
+        )
+    elif task == "enhance":
+        result = generator.enhance_existing_content(
+            original_content=job["content"],
+            enhancement_type=job.get("enhancement_type", "expand")
+        )
+    elif task == "blog":
+        result = create_blog_pipeline(job["topic"], generator)
+    else:
+        raise ValueError(f"Unknown task '{task}', expected one of: {', '.join(TASKS)}")
+
+    if not result:
+        raise RuntimeError(f"{task} produced no content")
+    return result
+
+def run_worker(generator, lines, output, workers):
+    """Process JSONL jobs from lines, writing one JSONL result per job as each finishes"""
+    write_lock = threading.Lock()
+    counts = {"ok": 0, "failed": 0}
+
+    def process(number, line):
+        start = time.perf_counter()
+        job = {}
+        try:
+            job = json.loads(line)
+            record = {"result": run_task(generator, job), "ok": True}
+        except Exception as e:
+            record = {"error": str(e), "ok": False}
+        record.update({
+            "id": job.get("id", number) if isinstance(job, dict) else number,
+            "task": job.get("task") if isinstance(job, dict) else None,
+            "elapsed": round(time.perf_counter() - start, 2),
+        })
+        with write_lock:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            counts["ok" if record["ok"] else "failed"] += 1
+
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            # Read ahead only a little, so jobs can be streamed in from another process
+            if len(pending) >= workers * 2:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending.add(executor.submit(process, number, line))
+    return counts
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--api-key", default=None, help="Gemini API key (default: GEMINI_API_KEY)")
+    common.add_argument("--backend-url", default=None,
+                        help="Use an HTTP model backend (e.g. benchmarks/fake_llm_server.py) instead of Gemini")
+    common.add_argument("--quiet", action="store_true", help="Only report errors on stderr")
+    common.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    parser = argparse.ArgumentParser(description="Generate content without the Streamlit app")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    expand = commands.add_parser("expand", parents=[common], help="Generate expanded content for a topic")
+    expand.add_argument("topic")
+    expand.add_argument("--type", dest="content_type", default="blog")
+    expand.add_argument("--length", dest="target_length", type=int, default=2000)
+    expand.add_argument("--style", default="professional")
+    expand.add_argument("--stream", action="store_true", help="Print text as it is generated")
+
+    variations = commands.add_parser("variations", parents=[common], help="Generate several variations of a topic")
+    variations.add_argument("topic")
+    variations.add_argument("--count", type=int, default=3)
+    variations.add_argument("--length", dest="target_length", type=int, default=2000)
+
+    enhance = commands.add_parser("enhance", parents=[common], help="Enhance a text file ('-' for stdin)")
+    enhance.add_argument("file")
+    enhance.add_argument("--type", dest="enhancement_type", default="expand",
+                         choices=["expand", "rewrite", "improve", "summarize"])
+
+    blog = commands.add_parser("blog", parents=[common], help="Run the blog pipeline for a topic")
+    blog.add_argument("topic")
+
+    worker = commands.add_parser("worker", parents=[common], help="Process JSONL jobs from stdin, results to stdout")
+    worker.add_argument("--workers", type=int, default=4, help="Jobs in progress at once")
+
+    args = parser.parse_args()
+
+    backend = None
+    api_key = args.api_key
+    if args.backend_url:
+        backend = HTTPBackend(args.backend_url)
+    else:
+        if not api_key:
+            api_key = get_gemini_api_key()
+        if not api_key:
+            parser.error("Set GEMINI_API_KEY or pass --api-key")
+
+    def on_event(kind, message):
+        if kind == "error" or not args.quiet:
+            print_event(kind, message)
+
+    max_workers = args.workers if args.command == "worker" else 5
+    generator = ContentGenerator(api_key, max_workers=max_workers, on_event=on_event, backend=backend)
+
+    if args.command == "worker":
+        counts = run_worker(generator, sys.stdin, sys.stdout, args.workers)
+        print_event("info", f"Worker done: {counts['ok']} succeeded, {counts['failed']} failed")
+        sys.exit(1 if counts["failed"] else 0)
+
+    if args.command == "expand" and args.stream and not args.json:
+        produced = False
+        try:
+            for chunk in generator.stream_expanded_content(args.topic, args.content_type, args.target_length,
+                                                           args.style, raise_errors=True):
+                produced = True
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+        except Exception as e:
+            print()
+            print_event("error", f"Error generating content: {str(e)}")
+            sys.exit(1)
+        print()
+        sys.exit(0 if produced else 1)
+
+    job = {"task": args.command, **{k: v for k, v in vars(args).items() if k not in ("api_key", "backend_url", "quiet", "json", "command")}}
+    if args.command == "enhance":
+        if args.file == "-":
+            job["content"] = sys.stdin.read()
+        else:
+            with open(args.file, encoding="utf-8") as f:
+                job["content"] = f.read()
+
+    try:
+        result = run_task(generator, job)
+    except Exception as e:
+        print_event("error", str(e))
+        sys.exit(1)
+
+    if args.json or not isinstance(result, str):
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(result)
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,328 @@
-import google.generativeai as genai
-import streamlit as st
+import os
+import sys
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import os
+import re
+import math
+import itertools
+
+from rate_limiter import QuotaLimiter
+from llm_cache import cache_key, get_response_cache
+from llm_metrics import get_llm_metrics
+from resilience import ResilientCaller, RetryPolicy, CircuitBreaker
+from pipeline import Stage, run_pipeline
+from llm_backends import GeminiBackend
+
+# Gemini 1.5 Flash free-tier quota
+DEFAULT_REQUESTS_PER_MINUTE = 15
+DEFAULT_TOKENS_PER_MINUTE = 1000000
+
+# Enhancement inputs longer than this are processed in chunks (map-reduce)
+CHUNKED_ENHANCE_MIN_WORDS = 3000
+# Chunk size bounds; within them, chunks are sized so one wave of workers covers the input
+MIN_CHUNK_WORDS = 1000
+MAX_CHUNK_WORDS = 2500
+
+# Targets of at least this many words are written outline-first, section by section
+SECTIONED_MIN_WORDS = 2500
+# Rough words per outline section, and the section count bounds
+SECTION_WORDS = 350
+MIN_SECTIONS = 4
+MAX_SECTIONS = 12
+# Extra attempts for a section that fails or comes back under half its budget
+SECTION_RETRIES = 2
+
+# Structured (multi-output) calls are only used while the combined outputs stay under this many words
+STRUCTURED_MAX_WORDS = 3000
+
+# Event kinds passed to on_event handlers
+EVENT_KINDS = ("heading", "info", "success", "warning", "error")
+
+_HEADING_RE = re.compile(r"^(?=#{1,6}\s)", re.MULTILINE)
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+def estimate_tokens(prompt, expected_output_words=0):
+    """Rough token estimate for quota accounting (about 1.3 tokens per word)"""
+    return int((len(prompt.split()) + expected_output_words) * 1.3)
+
+def print_event(kind, message):
+    """Default event handler for headless use: progress and errors go to stderr"""
+    prefix = "❌ " if kind == "error" else ""
+    print(f"{prefix}{message}", file=sys.stderr)
+
+def parse_json_response(text):
+    """Parse JSON from a model response, tolerating markdown code fences and surrounding prose"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+        if not starts:
+            raise
+        start = min(starts)
+        end = text.rfind("}" if text[start] == "{" else "]")
+        return json.loads(text[start:end + 1])
+
+def _valid_text(value, min_words=1, max_chars=None):
+    """Check a structured-output field: a string with enough words and not too long"""
+    if not isinstance(value, str) or len(value.split()) < min_words:
+        return False
+    return max_chars is None or len(value.strip()) <= max_chars
+
+def _split_oversized(text, max_words, patterns):
+    """Split text on the first pattern, recursing with finer ones for pieces still too long"""
+    if len(text.split()) <= max_words:
+        return [text]
+    if not patterns:
+        words = text.split()
+        return [" ".join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+    pieces = []
+    for piece in patterns[0].split(text):
+        if piece.strip():
+            pieces.extend(_split_oversized(piece, max_words, patterns[1:]))
+    return pieces
+
+def split_into_chunks(text, max_words):
+    """
+    Split a document into chunks of at most max_words words
+
+    Markdown headings are preferred as boundaries, then blank-line
+    paragraphs, then sentences. Consecutive small pieces are packed together
+    so chunks stay close to max_words.
+    """
+    pieces = _split_oversized(text.strip(), max_words, [_HEADING_RE, _PARAGRAPH_RE, _SENTENCE_RE])
+    chunks = []
+    current, current_words = [], 0
+    for piece in pieces:
+        words = len(piece.split())
+        if current and current_words + words > max_words:
+            chunks.append("\n\n".join(current))
+            current, current_words = [], 0
+        current.append(piece.strip())
+        current_words += words
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
 
 class ContentGenerator:
-    def __init__(self, api_key):
-        """Initialize the Gemini API client"""
-        genai.configure(api_key=api_key)
-        # Updated model name - the old 'gemini-pro' is deprecated
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-        
-    def generate_expanded_content(self, topic, content_type="blog", target_length=2000, style="professional"):
+    def __init__(self, api_key=None, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, max_workers=5, cache="default",
+                 structured_outputs=False, metrics="default", max_retries=3, hedge_requests=False,
+                 on_event=None, semantic_cache="default", backend=None):
         """
-        Generate expanded content using Gemini API
-        
+        Initialize the Gemini API client
+
         Args:
-            topic (str): The main topic or prompt
-            content_type (str): Type of content (blog, article, essay, etc.)
-            target_length (int): Target word count
-            style (str): Writing style (professional, casual, academic, etc.)
+            api_key (str): Gemini API key (not needed with a backend)
+            requests_per_minute (int): Request quota shared by all calls (None to disable)
+            tokens_per_minute (int): Token quota shared by all calls (None to disable)
+            max_workers (int): Maximum concurrent requests for batch methods
+            cache (ResponseCache): Response cache; "default" uses the shared
+                cache (disabled by LLM_CACHE=0), None turns caching off
+            structured_outputs (bool): Request several short outputs (blog
+                meta + social posts, short variations) in one JSON-schema call,
+                falling back to per-item calls for invalid items
+            metrics (LLMMetrics): Per-call metrics collector; "default" uses the
+                shared collector (disabled by LLM_METRICS=0), None turns it off
+            max_retries (int): Retries with jittered exponential backoff for
+                transient API errors (rate limits, 5xx, timeouts)
+            hedge_requests (bool): Send a duplicate request when a call runs
+                past the recent p95 latency for its kind, and use whichever
+                returns first (costs extra quota on slow calls)
+            on_event (callable): Progress/error handler called as
+                on_event(kind, message) with kind in EVENT_KINDS; defaults to
+                print_event. The Streamlit app passes a handler that renders
+                the messages.
+            semantic_cache (SemanticCache): Near-duplicate topic cache for
+                generate_expanded_content; "default" uses the shared cache
+                (off unless SEMANTIC_CACHE=1), None turns it off
+            backend: Model backend (see llm_backends); defaults to Gemini
+                with api_key. An HTTPBackend pointed at
+                benchmarks/fake_llm_server.py runs the generator offline.
+        """
+        # Updated model name - the old 'gemini-pro' is deprecated
+        self.model = backend or GeminiBackend(api_key, 'gemini-1.5-flash')
+        self.limiter = QuotaLimiter(requests_per_minute, tokens_per_minute)
+        self.max_workers = max_workers
+        self.cache = get_response_cache() if cache == "default" else cache
+        self.structured_outputs = structured_outputs
+        self.metrics = get_llm_metrics() if metrics == "default" else metrics
+        # Fails fast once the API keeps failing, instead of every caller waiting out its retries
+        self.resilience = ResilientCaller(RetryPolicy(max_retries + 1), CircuitBreaker(name=self.model.model_name),
+                                          hedging=hedge_requests)
+        self.on_event = on_event or print_event
+        if semantic_cache == "default":
+            semantic_cache = None
+            # Imported only when enabled, so numpy is not loaded otherwise
+            if os.getenv("SEMANTIC_CACHE", "0") == "1":
+                from semantic_cache import get_semantic_cache
+                semantic_cache = get_semantic_cache()
+        self.semantic_cache = semantic_cache
+
+    def _emit(self, kind, message):
+        self.on_event(kind, message)
+
+    def _record_call(self, tag, start, queue_ms=0.0, usage=None, ttft_ms=None, cached=False, error=None,
+                     retries=0):
+        """Report one call to the metrics collector; tag is (method, content_type)"""
+        if self.metrics is None:
+            return
+        method, content_type = tag or ("generate", None)
+        self.metrics.record(
+            method, content_type, self.model.model_name,
+            latency_ms=(time.perf_counter() - start) * 1000 - queue_ms,
+            queue_ms=queue_ms,
+            ttft_ms=ttft_ms,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            output_tokens=getattr(usage, "candidates_token_count", None),
+            cached=cached,
+            retries=retries,
+            error=error
+        )
+
+    def _wait_for_quota(self, prompt, expected_output_words, state):
+        """
+        Returns a before-attempt hook that waits for quota and adds the wait
+        to state; with blocking=False (hedged duplicates) it only takes quota
+        that is available right away
+        """
+        tokens = estimate_tokens(prompt, expected_output_words)
+
+        def wait(blocking=True):
+            if not blocking:
+                return self.limiter.try_acquire(tokens)
+            wait_start = time.perf_counter()
+            self.limiter.acquire(tokens)
+            state["queue_ms"] += (time.perf_counter() - wait_start) * 1000
+            return True
+        return wait
+
+    @staticmethod
+    def _count_retry(state):
+        def on_retry(attempt, error, delay):
+            state["retries"] += 1
+        return on_retry
+
+    def _generate(self, prompt, expected_output_words=0, use_cache=True, generation_config=None, tag=None):
+        """
+        Return the model's text for a prompt
+
+        Identical (model, prompt, params) calls are answered from the response
+        cache; otherwise the call waits for the rate limiter and goes through
+        the resilience layer (retries, circuit breaker, optional hedging).
+        Every call is recorded in the metrics collector under tag
+        (method, content_type).
+        """
+        start = time.perf_counter()
+        key = None
+        if self.cache is not None and use_cache:
+            key = cache_key(self.model.model_name, prompt, generation_config)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._record_call(tag, start, cached=True)
+                return cached
+
+        state = {"queue_ms": 0.0, "retries": 0}
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        try:
+            response = self.resilience.call(
+                lambda: self.model.generate_content(prompt, **kwargs),
+                key=tag,
+                on_retry=self._count_retry(state),
+                before_attempt=self._wait_for_quota(prompt, expected_output_words, state)
+            )
+            text = response.text
+        except Exception as e:
+            self._record_call(tag, start, state["queue_ms"], error=e, retries=state["retries"])
+            raise
+        self._record_call(tag, start, state["queue_ms"], usage=getattr(response, "usage_metadata", None),
+                          retries=state["retries"])
+
+        if key is not None:
+            self.cache.put(key, text)
+        return text
+
+    def _generate_structured(self, prompt, schema, expected_output_words=0, tag=None):
+        """Return the parsed JSON response for a prompt constrained to a response schema"""
+        generation_config = {"response_mime_type": "application/json", "response_schema": schema}
+        text = self._generate(prompt, expected_output_words, generation_config=generation_config, tag=tag)
+        return parse_json_response(text)
+
+    def generate_text(self, prompt, expected_output_words=0, tag=None):
         """
+        Return the model's text for a free-form prompt
+
+        Goes through the same cache, rate limiter, retries and metrics as the
+        other methods; errors are raised. tag is (method, content_type) for
+        metrics.
+        """
+        return self._generate(prompt, expected_output_words, tag=tag)
+
+    def generate_json(self, prompt, schema, expected_output_words=0, tag=None):
+        """Like generate_text, constrained to a JSON response schema; returns the parsed JSON"""
+        return self._generate_structured(prompt, schema, expected_output_words, tag=tag)
+
+    def _generate_stream(self, prompt, expected_output_words=0, use_cache=True, tag=None):
+        """
+        Yield the model's text for a prompt chunk by chunk
+
+        A cached response is yielded whole; a fresh one is streamed from the
+        API and cached once complete. Opening the stream (up to the first
+        chunk) is retried on transient errors; once text has been yielded,
+        errors propagate. Metrics include time to first chunk.
+        """
+        start = time.perf_counter()
+        key = None
+        if self.cache is not None and use_cache:
+            key = cache_key(self.model.model_name, prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._record_call(tag, start, cached=True)
+                yield cached
+                return
+
+        state = {"queue_ms": 0.0, "retries": 0}
+
+        def open_stream():
+            stream = iter(self.model.generate_content(prompt, stream=True))
+            return stream, next(stream, None)
+
+        chunks = []
+        usage = None
+        ttft_ms = None
+        try:
+            stream, first = self.resilience.call(open_stream, key=tag, hedge=False,
+                                                 on_retry=self._count_retry(state),
+                                                 before_attempt=self._wait_for_quota(prompt, expected_output_words, state))
+            for chunk in itertools.chain([first] if first is not None else [], stream):
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. safety metadata only)
+                    continue
+                if text:
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - start) * 1000 - state["queue_ms"]
+                    chunks.append(text)
+                    yield text
+        except Exception as e:
+            self._record_call(tag, start, state["queue_ms"], ttft_ms=ttft_ms, error=e, retries=state["retries"])
+            raise
+        self._record_call(tag, start, state["queue_ms"], usage=usage, ttft_ms=ttft_ms, retries=state["retries"])
+
+        if key is not None:
+            self.cache.put(key, "".join(chunks))
         
+    def _expanded_prompt(self, topic, content_type, target_length, style):
         # Create a detailed prompt for content generation
-        prompt = f"""
+        return f"""
         Create a comprehensive {content_type} post about: {topic}
         
         Requirements:
@@ -38,30 +336,239 @@ class ContentGenerator:
         
         Structure the content with proper formatting using markdown.
         """
+
+    def _outline_prompt(self, topic, content_type, target_length, style, sections):
+        return f"""
+        Plan a comprehensive {content_type} post about: {topic}
+        
+        Requirements:
+        - Total length: approximately {target_length} words
+        - Writing style: {style}
+        - {sections} sections, starting with an introduction and ending with a conclusion
+        - Each section gets a word budget; budgets should add up to about {target_length}
+        
+        Respond with JSON only, in this format:
+        {{"title": "...", "sections": [{{"heading": "...", "points": ["...", "..."], "words": 300}}]}}
+        """
+
+    def _plan_sections(self, topic, content_type, target_length, style):
+        """
+        Ask for an outline and return (title, sections)
+
+        Section word budgets are rescaled so they add up to target_length.
+        Raises ValueError if the outline is unusable.
+        """
+        count = min(MAX_SECTIONS, max(MIN_SECTIONS, round(target_length / SECTION_WORDS)))
+        prompt = self._outline_prompt(topic, content_type, target_length, style, count)
+        outline = parse_json_response(self._generate(prompt, count * 40, tag=("generate_expanded_content", "outline")))
+
+        sections = []
+        for section in outline.get("sections") or []:
+            if isinstance(section, dict) and str(section.get("heading", "")).strip():
+                try:
+                    words = max(1, int(section.get("words") or 0))
+                except (TypeError, ValueError):
+                    words = 1
+                points = section.get("points") or []
+                sections.append({
+                    "heading": str(section["heading"]).strip().lstrip("#").strip(),
+                    "points": [str(point) for point in points] if isinstance(points, list) else [str(points)],
+                    "words": words,
+                })
+        if len(sections) < 2:
+            raise ValueError("Outline has fewer than two sections")
+
+        planned = sum(section["words"] for section in sections)
+        for section in sections:
+            section["words"] = max(80, round(section["words"] * target_length / planned))
+        title = str(outline.get("title") or topic).strip()
+        return title, sections
+
+    def _section_prompt(self, topic, content_type, style, title, sections, index):
+        section = sections[index]
+        outline = "\n".join(f"{i+1}. {s['heading']}" for i, s in enumerate(sections))
+        points = "\n".join(f"- {point}" for point in section["points"]) or "- Cover the heading thoroughly"
+        return f"""
+        You are writing one section of a {content_type} post titled "{title}" about: {topic}
+        
+        Full outline:
+        {outline}
         
+        Write section {index+1}: {section['heading']}
+        
+        Requirements:
+        - Length: approximately {section['words']} words
+        - Writing style: {style}
+        - Start with the heading "## {section['heading']}" and use ### subheadings where useful
+        - Cover these points:
+        {points}
+        - Provide detailed explanations and examples
+        - Only write this section; do not repeat material belonging to other sections
+        """
+
+    def _write_section(self, prompt, budget, content_type):
+        """Generate one section, retrying failures and responses under half the budget"""
+        best, error = None, None
+        for attempt in range(SECTION_RETRIES + 1):
+            try:
+                # Retries must not be answered by the cached short response
+                text = self._generate(prompt, budget, use_cache=attempt == 0,
+                                      tag=("generate_expanded_content", f"{content_type}_section")).strip()
+            except Exception as e:
+                error = e
+                continue
+            if best is None or len(text.split()) > len(best.split()):
+                best = text
+            if len(best.split()) >= budget / 2:
+                break
+        if best is None:
+            raise error
+        return best
+
+    def _iter_sectioned_content(self, topic, content_type, target_length, style):
+        """
+        Outline-first generation: plan sections, expand them concurrently, assemble in order
+
+        Yields the title and then each section as soon as it and all sections
+        before it are done. Falls back to a single call if no usable outline
+        comes back.
+        """
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            title, sections = self._plan_sections(topic, content_type, target_length, style)
+        except (ValueError, TypeError, AttributeError) as e:
+            self._emit("warning", f"Outline unavailable ({str(e)}), generating in one pass")
+            prompt = self._expanded_prompt(topic, content_type, target_length, style)
+            yield self._generate(prompt, target_length, tag=("generate_expanded_content", content_type))
+            return
+
+        self._emit("info", f"Writing {len(sections)} sections in parallel...")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(sections)))) as executor:
+            futures = [
+                executor.submit(
+                    self._write_section,
+                    self._section_prompt(topic, content_type, style, title, sections, i),
+                    section["words"],
+                    content_type
+                )
+                for i, section in enumerate(sections)
+            ]
+            yield f"# {title}\n\n"
+            for i, future in enumerate(futures):
+                try:
+                    yield future.result() + "\n\n"
+                except Exception as e:
+                    for pending in futures:
+                        pending.cancel()
+                    raise RuntimeError(f"Section {i+1} ({sections[i]['heading']}) failed: {str(e)}") from e
+
+    def _use_sections(self, target_length, sectioned):
+        if sectioned is None:
+            return target_length >= SECTIONED_MIN_WORDS
+        return sectioned
+
+    def _semantic_namespace(self, content_type, target_length, style):
+        return f"expanded|{self.model.model_name}|{content_type}|{target_length}|{style}"
+
+    def _reuse_similar(self, topic, content_type, target_length, style, tag):
+        """Return content generated for a near-duplicate topic with the same settings, or None"""
+        if self.semantic_cache is None:
+            return None
+        start = time.perf_counter()
+        match = self.semantic_cache.get(self._semantic_namespace(content_type, target_length, style), topic)
+        if match is None:
+            return None
+        content, matched_topic, similarity = match
+        self._record_call(tag, start, cached=True)
+        self._emit("info", f"Reusing content generated for a similar topic: \"{matched_topic}\" "
+                           f"(similarity {similarity:.2f})")
+        return content
+
+    def _remember_similar(self, topic, content_type, target_length, style, content):
+        if self.semantic_cache is not None and content:
+            self.semantic_cache.put(self._semantic_namespace(content_type, target_length, style), topic, content)
+
+    def generate_expanded_content(self, topic, content_type="blog", target_length=2000, style="professional",
+                                  sectioned=None, raise_errors=False):
+        """
+        Generate expanded content using Gemini API
+
+        Long targets are generated outline-first: one call plans the sections
+        with word budgets, the sections are written concurrently and then
+        assembled in order. With a semantic cache, content for a
+        near-duplicate topic with the same settings is reused.
+        
+        Args:
+            topic (str): The main topic or prompt
+            content_type (str): Type of content (blog, article, essay, etc.)
+            target_length (int): Target word count
+            style (str): Writing style (professional, casual, academic, etc.)
+            sectioned (bool): Force outline-first (True) or single-call (False)
+                generation; None uses sections from SECTIONED_MIN_WORDS words
+            raise_errors (bool): Raise generation errors instead of reporting
+                them and returning None (for batch and pipeline callers)
+        """
+        tag = ("generate_expanded_content", content_type)
+        reused = self._reuse_similar(topic, content_type, target_length, style, tag)
+        if reused is not None:
+            return reused
+        try:
+            if self._use_sections(target_length, sectioned):
+                content = "".join(self._iter_sectioned_content(topic, content_type, target_length, style)).strip()
+            else:
+                prompt = self._expanded_prompt(topic, content_type, target_length, style)
+                content = self._generate(prompt, target_length, tag=tag)
         except Exception as e:
-            st.error(f"Error generating content: {str(e)}")
+            if raise_errors:
+                raise
+            self._emit("error", f"Error generating content: {str(e)}")
             return None
+        self._remember_similar(topic, content_type, target_length, style, content)
+        return content
+
+    def stream_expanded_content(self, topic, content_type="blog", target_length=2000, style="professional",
+                                sectioned=None, raise_errors=False):
+        """
+        Streaming version of generate_expanded_content
+
+        Yields text chunks as the model produces them, so the first words can
+        be shown long before the full response is done. Outline-first
+        generation yields whole sections in order. Takes the same arguments
+        as generate_expanded_content; a stream that fails midway stops after
+        an error event, or raises with raise_errors, so callers can tell
+        partial text from a finished response.
+        """
+        tag = ("stream_expanded_content", content_type)
+        reused = self._reuse_similar(topic, content_type, target_length, style, tag)
+        if reused is not None:
+            yield reused
+            return
+        chunks = []
+        try:
+            if self._use_sections(target_length, sectioned):
+                source = self._iter_sectioned_content(topic, content_type, target_length, style)
+            else:
+                prompt = self._expanded_prompt(topic, content_type, target_length, style)
+                source = self._generate_stream(prompt, target_length, tag=tag)
+            for chunk in source:
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            if raise_errors:
+                raise
+            self._emit("error", f"Error generating content: {str(e)}")
+            return
+        self._remember_similar(topic, content_type, target_length, style, "".join(chunks).strip())
     
-    def generate_multiple_variations(self, topic, count=5, target_length=2000):
-        """Generate multiple variations of content for the same topic"""
-        variations = []
-        
-        for i in range(count):
-            st.write(f"Generating variation {i+1}/{count}...")
-            
-            # Different styles for each variation
-            styles = ["professional", "casual", "academic", "conversational", "technical"]
-            style = styles[i % len(styles)]
-            
-            prompt = f"""
+    def _variation_prompt(self, topic, index, target_length):
+        # Different styles for each variation
+        styles = ["professional", "casual", "academic", "conversational", "technical"]
+        style = styles[index % len(styles)]
+
+        prompt = f"""
             Create a unique {target_length}-word article about: {topic}
             
             Style: {style}
-            Variation: #{i+1}
+            Variation: #{index+1}
             
             Make this version distinct from other articles on the same topic by:
             - Taking a unique angle or perspective
@@ -71,35 +578,130 @@ class ContentGenerator:
             
             Format with markdown headings and ensure high quality, original content.
             """
+        return style, prompt
+
+    def _structured_variations(self, topic, count, target_length):
+        """
+        Request all variations in one JSON-schema call
+
+        Returns {index: content} for the variations that pass validation;
+        missing or invalid ones are left out for per-item calls.
+        """
+        styles = [self._variation_prompt(topic, i, target_length)[0] for i in range(count)]
+        listing = "\n".join(f"{i+1}. Style: {style}" for i, style in enumerate(styles))
+        prompt = f"""
+            Create {count} unique articles of about {target_length} words each about: {topic}
             
-            try:
-                response = self.model.generate_content(prompt)
-                variations.append({
-                    'variation': i+1,
-                    'style': style,
-                    'content': response.text,
-                    'word_count': len(response.text.split()),
-                    'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
-                
-                # Add delay to respect API rate limits
-                time.sleep(1)
-                
-            except Exception as e:
-                st.error(f"Error generating variation {i+1}: {str(e)}")
+            Variations:
+            {listing}
+            
+            Make each version distinct from the others by:
+            - Taking a unique angle or perspective
+            - Using different examples and case studies
+            - Varying the structure and flow
+            - Incorporating different subtopics and details
+            
+            Format each article's content with markdown headings and ensure high quality, original content.
+            Return the variations in the order listed.
+            """
+        schema = {
+            "type": "object",
+            "properties": {
+                "variations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"variation": {"type": "integer"}, "content": {"type": "string"}},
+                        "required": ["variation", "content"],
+                    },
+                }
+            },
+            "required": ["variations"],
+        }
+        data = self._generate_structured(prompt, schema, count * target_length,
+                                         tag=("generate_multiple_variations", "structured"))
+
+        contents = {}
+        items = data.get("variations") if isinstance(data, dict) else None
+        for position, item in enumerate(items if isinstance(items, list) else []):
+            if not isinstance(item, dict):
                 continue
-        
-        return variations
-    
-    def enhance_existing_content(self, original_content, enhancement_type="expand"):
+            try:
+                index = int(item.get("variation", position + 1)) - 1
+            except (TypeError, ValueError):
+                index = position
+            if 0 <= index < count and index not in contents and _valid_text(item.get("content"), target_length // 2):
+                contents[index] = item["content"].strip()
+        return contents
+
+    def generate_multiple_variations(self, topic, count=5, target_length=2000, progress_callback=None):
         """
-        Enhance existing content by expanding, rewriting, or improving it
-        
+        Generate multiple variations of content for the same topic
+
+        Variations are requested concurrently (up to max_workers at a time)
+        within the generator's rate limits and returned in variation order.
+        With structured_outputs, short variations are requested together in
+        one call first and only the invalid ones are generated separately.
+
         Args:
-            original_content (str): The original content to enhance
-            enhancement_type (str): Type of enhancement (expand, rewrite, improve, summarize)
+            topic (str): The main topic
+            count (int): Number of variations
+            target_length (int): Target word count per variation
+            progress_callback (callable): Called as progress_callback(done, count, variation)
+                after each variation finishes; variation is None if it failed
         """
-        
+        def record(index, style, content):
+            return {
+                'variation': index+1,
+                'style': style,
+                'content': content,
+                'word_count': len(content.split()),
+                'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+
+        def generate(index):
+            style, prompt = self._variation_prompt(topic, index, target_length)
+            return record(index, style, self._generate(prompt, target_length,
+                                                       tag=("generate_multiple_variations", style)))
+
+        variations = []
+        done = 0
+        remaining = list(range(count))
+        if self.structured_outputs and count > 1 and count * target_length <= STRUCTURED_MAX_WORDS:
+            self._emit("info", f"Generating {count} variations in one request...")
+            try:
+                contents = self._structured_variations(topic, count, target_length)
+            except Exception as e:
+                self._emit("warning", f"Combined request failed ({str(e)}), generating variations separately")
+                contents = {}
+            for index, content in sorted(contents.items()):
+                variation = record(index, self._variation_prompt(topic, index, target_length)[0], content)
+                variations.append(variation)
+                remaining.remove(index)
+                done += 1
+                if progress_callback:
+                    progress_callback(done, count, variation)
+
+        if remaining:
+            self._emit("info", f"Generating {len(remaining)} variations in parallel...")
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(remaining)))) as executor:
+                futures = {executor.submit(generate, i): i for i in remaining}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    variation = None
+                    try:
+                        variation = future.result()
+                        variations.append(variation)
+                    except Exception as e:
+                        self._emit("error", f"Error generating variation {i+1}: {str(e)}")
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, count, variation)
+
+        variations.sort(key=lambda v: v['variation'])
+        return variations
+    
+    def _enhancement_prompt(self, original_content, enhancement_type):
         enhancement_prompts = {
             "expand": f"""
             Take the following content and expand it significantly while maintaining the original message and tone:
@@ -157,65 +759,202 @@ class ContentGenerator:
             """
         }
         
-        prompt = enhancement_prompts.get(enhancement_type, enhancement_prompts["expand"])
+        return enhancement_prompts.get(enhancement_type, enhancement_prompts["expand"])
+
+    def _chunk_size(self, total_words):
+        return min(MAX_CHUNK_WORDS, max(MIN_CHUNK_WORDS, math.ceil(total_words / max(1, self.max_workers))))
+
+    def _use_chunks(self, original_content, chunked):
+        if chunked is None:
+            return len(original_content.split()) > CHUNKED_ENHANCE_MIN_WORDS
+        return chunked
+
+    def _chunk_prompt(self, chunk, enhancement_type, index, total, target_words):
+        instructions = {
+            "expand": "Expand this part significantly while keeping its message, tone and headings. "
+                      "Add detailed explanations, relevant examples and additional insights.",
+            "rewrite": "Rewrite this part completely with different wording and sentence structures, "
+                       "keeping the same core information and headings.",
+            "improve": "Fix any grammatical errors, improve clarity and flow, and add missing context, "
+                       "keeping its headings and structure.",
+            "summarize": "Summarize the key points and important details of this part.",
+        }
+        instruction = instructions.get(enhancement_type, instructions["expand"])
+        return f"""
+            The following is part {index + 1} of {total} of a longer document.
+            
+            {instruction}
+            Aim for about {target_words} words. Return only the processed text for this part in
+            markdown, without an introduction or conclusion for the whole document.
+            
+            Part {index + 1}:
+            {chunk}
+            """
+
+    def _chunk_budget(self, chunk_words, total_words, enhancement_type):
+        if enhancement_type == "summarize":
+            return max(60, round(800 * chunk_words / total_words))
+        if enhancement_type in ("rewrite", "improve"):
+            return chunk_words
+        return chunk_words * 2
+
+    def _iter_chunked_enhancement(self, chunks, enhancement_type, failed):
+        """
+        Map the enhancement over chunks concurrently, then reduce
+
+        Chunk results are yielded in document order as soon as each one and
+        all before it are done. Summaries are condensed by one final call;
+        other types are stitched together. A failed chunk keeps its original
+        text (or is left out of a summary) and its index is added to failed.
+        """
+        total_words = sum(len(chunk.split()) for chunk in chunks)
+        self._emit("info", f"Processing {len(chunks)} parts in parallel...")
+
+        summaries = []
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(chunks)))) as executor:
+            futures = []
+            for i, chunk in enumerate(chunks):
+                budget = self._chunk_budget(len(chunk.split()), total_words, enhancement_type)
+                prompt = self._chunk_prompt(chunk, enhancement_type, i, len(chunks), budget)
+                futures.append(executor.submit(self._generate, prompt, budget,
+                                              tag=("enhance_existing_content", f"{enhancement_type}_chunk")))
+
+            for i, future in enumerate(futures):
+                try:
+                    text = future.result().strip()
+                except Exception as e:
+                    self._emit("error", f"Error enhancing part {i+1}: {str(e)}")
+                    failed.append(i)
+                    if enhancement_type == "summarize":
+                        continue
+                    text = chunks[i]
+                if enhancement_type == "summarize":
+                    summaries.append(text)
+                else:
+                    yield text + "\n\n"
+
+        if enhancement_type != "summarize" or not summaries:
+            return
+        if len(summaries) == 1:
+            yield summaries[0]
+            return
+
+        partial = "\n\n".join(summaries)
+        reduce_prompt = f"""
+            The following partial summaries cover consecutive parts of one document, in order.
+            Combine them into one comprehensive summary of the whole document.
+            
+            Partial summaries:
+            {partial}
+            
+            Please create a detailed summary that:
+            - Captures all key points
+            - Maintains important details
+            - Is well-structured and readable
+            - Is approximately 500-800 words
+            """
+        yield from self._generate_stream(reduce_prompt, 800, tag=("enhance_existing_content", "summarize_reduce"))
+
+    def enhance_existing_content(self, original_content, enhancement_type="expand", chunked=None):
+        """
+        Enhance existing content by expanding, rewriting, or improving it
+
+        Long inputs are split on heading/paragraph boundaries and the chunks
+        are enhanced concurrently, then stitched (or, for summaries,
+        condensed in one final call).
+        
+        Args:
+            original_content (str): The original content to enhance
+            enhancement_type (str): Type of enhancement (expand, rewrite, improve, summarize)
+            chunked (bool): Force chunked (True) or single-call (False) mode;
+                None chunks inputs over CHUNKED_ENHANCE_MIN_WORDS words
+        """
+        if self._use_chunks(original_content, chunked):
+            chunks = split_into_chunks(original_content, self._chunk_size(len(original_content.split())))
+            failed = []
+            try:
+                content = "".join(self._iter_chunked_enhancement(chunks, enhancement_type, failed)).strip()
+            except Exception as e:
+                self._emit("error", f"Error enhancing content: {str(e)}")
+                return None
+            return content if content and len(failed) < len(chunks) else None
+
+        prompt = self._enhancement_prompt(original_content, enhancement_type)
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate(prompt, 2000, tag=("enhance_existing_content", enhancement_type))
         except Exception as e:
-            st.error(f"Error enhancing content: {str(e)}")
+            self._emit("error", f"Error enhancing content: {str(e)}")
             return None
 
+    def stream_enhanced_content(self, original_content, enhancement_type="expand", chunked=None,
+                                raise_errors=False):
+        """
+        Streaming version of enhance_existing_content; yields text chunks
+
+        Failures are reported like stream_expanded_content's. In chunked mode
+        the stream only fails if every part did.
+        """
+        try:
+            if self._use_chunks(original_content, chunked):
+                chunks = split_into_chunks(original_content, self._chunk_size(len(original_content.split())))
+                failed = []
+                yield from self._iter_chunked_enhancement(chunks, enhancement_type, failed)
+                if len(failed) == len(chunks):
+                    raise RuntimeError(f"All {len(chunks)} parts failed")
+                return
+            prompt = self._enhancement_prompt(original_content, enhancement_type)
+            yield from self._generate_stream(prompt, 2000, tag=("stream_enhanced_content", enhancement_type))
+        except Exception as e:
+            if raise_errors:
+                raise
+            self._emit("error", f"Error enhancing content: {str(e)}")
+
 def save_generated_content(content_data, filename=None):
-    """Save generated content to a file"""
+    """
+    Save generated content to the content store
+
+    The record is appended to the compressed, append-only store (see
+    content_store.py) and indexed by topic and time. Saving again under the
+    same filename supersedes the earlier record.
+
+    Returns:
+        str: Location of the record, "<segment file>#<record id>"
+    """
+    from content_store import get_content_store
+
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"generated_content_{timestamp}.json"
-    
-    # Create outputs directory if it doesn't exist
-    os.makedirs("outputs", exist_ok=True)
-    
-    filepath = os.path.join("outputs", filename)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(content_data, f, indent=2, ensure_ascii=False)
-    
-    return filepath
+
+    store = get_content_store()
+    record_id = store.append(content_data, name=filename)
+    return store.location(record_id)
 
 def create_blog_pipeline(topic, generator):
-    """Complete blog creation pipeline"""
-    st.subheader("🚀 Blog Creation Pipeline")
-    
-    # Step 1: Generate main content
-    st.write("**Step 1:** Generating main blog content...")
-    main_content = generator.generate_expanded_content(
-        topic=topic,
-        content_type="blog post",
-        target_length=2000,
-        style="professional"
-    )
-    
-    if main_content:
-        st.success("✅ Main content generated!")
-        
-        # Step 2: Generate SEO meta description
-        st.write("**Step 2:** Generating SEO meta description...")
-        meta_prompt = f"""
+    """
+    Complete blog creation pipeline
+
+    The main post, meta description and social snippets only depend on the
+    topic, so they run as independent stages of one pipeline. Meta and
+    social stages fall back to placeholder text on failure or timeout; a
+    failed main stage fails the pipeline. Per-stage timings are included in
+    the returned package.
+
+    With generator.structured_outputs, the meta description and the three
+    social posts are requested in one JSON-schema call; only fields that
+    fail validation are requested again with their own prompts.
+    """
+    generator._emit("heading", "🚀 Blog Creation Pipeline")
+
+    meta_prompt = f"""
         Create a compelling SEO meta description (150-160 characters) for this blog post:
         Topic: {topic}
         
         Make it engaging and include relevant keywords.
         """
-        
-        try:
-            meta_response = generator.model.generate_content(meta_prompt)
-            meta_description = meta_response.text.strip()
-        except:
-            meta_description = f"Comprehensive guide about {topic}"
-        
-        # Step 3: Generate social media snippets
-        st.write("**Step 3:** Generating social media snippets...")
-        social_prompt = f"""
+
+    social_prompt = f"""
         Create 3 different social media posts to promote this blog about: {topic}
         
         1. Twitter post (280 characters max)
@@ -224,24 +963,105 @@ def create_blog_pipeline(topic, generator):
         
         Each should be engaging and include relevant hashtags.
         """
+
+    combined_prompt = f"""
+        Create promotional copy for a blog post about: {topic}
         
-        try:
-            social_response = generator.model.generate_content(social_prompt)
-            social_content = social_response.text
-        except:
-            social_content = "Social media content generation failed"
-        
-        # Compile complete blog package
-        blog_package = {
-            "topic": topic,
-            "main_content": main_content,
-            "meta_description": meta_description,
-            "social_media_content": social_content,
-            "word_count": len(main_content.split()),
-            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "api_used": "Google Gemini 1.5 Flash"
-        }
+        - meta_description: a compelling SEO meta description (150-160 characters) with relevant keywords
+        - twitter: a Twitter post (280 characters max)
+        - linkedin: a LinkedIn post (professional tone, 1-2 paragraphs)
+        - facebook: a Facebook post (engaging and casual, 1 paragraph)
         
-        return blog_package
-    
-    return None
\ No newline at end of file
+        Each social post should be engaging and include relevant hashtags.
+        """
+    combined_schema = {
+        "type": "object",
+        "properties": {
+            "meta_description": {"type": "string"},
+            "twitter": {"type": "string"},
+            "linkedin": {"type": "string"},
+            "facebook": {"type": "string"},
+        },
+        "required": ["meta_description", "twitter", "linkedin", "facebook"],
+    }
+    combined_checks = {
+        "meta_description": lambda value: _valid_text(value, 5, 300),
+        "twitter": lambda value: _valid_text(value, 3, 280),
+        "linkedin": lambda value: _valid_text(value, 15),
+        "facebook": lambda value: _valid_text(value, 10),
+    }
+
+    def combined(results):
+        # Keep only the fields that pass validation; the rest are requested separately
+        data = generator.generate_json(combined_prompt, combined_schema, 330,
+                                              tag=("create_blog_pipeline", "combined"))
+        if not isinstance(data, dict):
+            return {}
+        return {field: data[field].strip() for field, check in combined_checks.items() if check(data.get(field))}
+
+    def meta_description(results):
+        if "meta_description" in results.get("combined", {}):
+            return results["combined"]["meta_description"]
+        return generator.generate_text(meta_prompt, 30, tag=("create_blog_pipeline", "meta_description")).strip()
+
+    def social_media_content(results):
+        posts = results.get("combined", {})
+        if all(field in posts for field in ("twitter", "linkedin", "facebook")):
+            return (f"**Twitter:**\n{posts['twitter']}\n\n"
+                    f"**LinkedIn:**\n{posts['linkedin']}\n\n"
+                    f"**Facebook:**\n{posts['facebook']}")
+        return generator.generate_text(social_prompt, 300, tag=("create_blog_pipeline", "social_media"))
+
+    extras_depend_on = ["combined"] if generator.structured_outputs else []
+    stages = [
+        Stage("main_content",
+              lambda results: generator.generate_expanded_content(topic, "blog post", 2000, "professional",
+                                                                  sectioned=False, raise_errors=True),
+              timeout=180),
+        Stage("meta_description", meta_description, depends_on=extras_depend_on,
+              timeout=30, fallback=f"Comprehensive guide about {topic}"),
+        Stage("social_media_content", social_media_content, depends_on=extras_depend_on,
+              timeout=60, fallback="Social media content generation failed"),
+    ]
+    if generator.structured_outputs:
+        # An empty result sends both fields to their own prompts
+        stages.append(Stage("combined", combined, timeout=60, fallback={}))
+    labels = {
+        "main_content": "Main content",
+        "meta_description": "SEO meta description",
+        "social_media_content": "Social media snippets",
+        "combined": "Combined meta and social request",
+    }
+
+    def report(name, run):
+        seconds = run.timings[name]
+        if name in run.errors:
+            generator._emit("error", f"Error generating {labels[name].lower()}: {str(run.errors[name])}")
+        elif name in run.fallbacks:
+            generator._emit("warning", f"⚠️ {labels[name]} failed, using fallback ({seconds:.1f}s)")
+        else:
+            generator._emit("success", f"✅ {labels[name]} generated! ({seconds:.1f}s)")
+
+    generator._emit("info", "**Generating** main content, meta description and social snippets in parallel...")
+    # Callbacks run on this thread, so UI event handlers (e.g. Streamlit) stay in the caller's context
+    run = run_pipeline(stages, max_workers=generator.max_workers, on_stage_done=report)
+
+    if not run.ok("main_content") or not run.results["main_content"]:
+        return None
+
+    main_content = run.results["main_content"]
+
+    # Compile complete blog package
+    blog_package = {
+        "topic": topic,
+        "main_content": main_content,
+        "meta_description": run.results["meta_description"],
+        "social_media_content": run.results["social_media_content"],
+        "word_count": len(main_content.split()),
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "api_used": generator.model.model_name,
+        "stage_timings_ms": run.timings_ms(),
+        "total_time_ms": round(run.elapsed * 1000)
+    }
+
+    return blog_package
@@ -1,48 +1,355 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+from itertools import islice
+import threading
 import time
+import json
 
-def scrape_techcrunch(search_term="technology", max_articles=10):
+from http_cache import get_http_cache, body_digest
+from extraction_plan import ExtractionPlan, PreviousFigureIndex, resolve_parser_backend
+from rate_limiter import TokenBucket
+
+BASE_URL = "https://techcrunch.com"
+HACKERNOON_URL = "https://hackernoon.com"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# Worker threads used by scrape_many
+MAX_WORKERS = 8
+# Keep-alive connections kept open per host by the shared session
+POOL_SIZE = 32
+# Simultaneous requests allowed against a single host
+PER_HOST_LIMIT = 4
+# Bump when extraction output changes so cached parse results are ignored
+PARSE_VERSION = 2
+# Upper bound on result pages walked by iter_techcrunch_articles
+MAX_PAGES = 10
+
+# Shared extraction plan; collects selector hit rates and parse timings
+EXTRACTION_PLAN = ExtractionPlan()
+
+_session = None
+_session_lock = threading.Lock()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+def get_session():
+    """
+    Return the shared keep-alive session used for all scraper requests
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+def _host_slot(url):
+    """Return the semaphore limiting concurrent requests to the url's host"""
+    host = urlparse(url).netloc
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_slots[host]
+
+def fetch_page(url, timeout=15, use_cache=True):
+    """
+    Fetch a page through the shared session, respecting the per-host limit
+
+    With the persistent HTTP cache enabled the request is made conditional on
+    the cached ETag/Last-Modified and a 304 returns the cached body.
+    """
+    cache = get_http_cache() if use_cache else None
+    entry = cache.get(url) if cache else None
+    headers = cache.conditional_headers(entry) if cache else {}
+
+    with _host_slot(url):
+        response = get_session().get(url, headers=headers, timeout=timeout)
+
+    if entry and response.status_code == 304:
+        cache.touch(url)
+        return entry["body"]
+
+    response.raise_for_status()
+    if cache:
+        cache.put(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return response.text
+
+def search_url(search_term, page=1):
+    """Build the TechCrunch search URL for a term and result page"""
+    query = f"?s={search_term.replace(' ', '+')}"
+    if page > 1:
+        return f"{BASE_URL}/page/{page}/{query}"
+    return f"{BASE_URL}/{query}"
+
+def parse_search_results(html, max_articles=10, backend=None):
+    """
+    Parse a TechCrunch search results page into article dicts
+
+    Args:
+        html (str): Page markup
+        max_articles (int): Maximum number of containers to extract
+        backend (str): BeautifulSoup parser ("lxml", "html.parser", "html5lib"
+            or "auto"); defaults to the SCRAPER_PARSER environment variable
+    """
+    backend = resolve_parser_backend(backend)
+    start = time.perf_counter()
+
+    soup = BeautifulSoup(html, backend)
+    articles = []
+
+    # Find all article containers
+    article_containers = soup.find_all("div", class_="loop-card__content")
+
+    if not article_containers:
+        # Try alternative selectors
+        article_containers = soup.find_all("article") or soup.find_all("div", class_="post-block")
+
+    article_containers = article_containers[:max_articles]
+    figures = PreviousFigureIndex(soup, article_containers)
+
+    for container in article_containers:
+        article_data = extract_article_data(container, figures=figures)
+        if article_data["title"] and article_data["title"] != "No Title":
+            articles.append(article_data)
+
+    EXTRACTION_PLAN.record_parse(backend, (time.perf_counter() - start) * 1000)
+    return articles
+
+def get_parse_stats():
+    """Return parse timings and selector hit rates collected so far"""
+    return EXTRACTION_PLAN.stats()
+
+def fetch_search_page(search_term, page=1):
+    """
+    Fetch and parse one page of search results
+
+    Returns [] for a missing page past the first, which marks the end of results.
+    """
+    url = search_url(search_term, page)
+    try:
+        html = fetch_page(url)
+    except requests.HTTPError as e:
+        if page > 1 and e.response is not None and e.response.status_code == 404:
+            return []
+        raise
+
+    # Unchanged pages reuse the articles parsed from them last time
+    cache = get_http_cache()
+    variant = f"search:v{PARSE_VERSION}"
+    if cache:
+        digest = body_digest(html)
+        cached = cache.get_derived(url, variant, digest)
+        if cached is not None:
+            return json.loads(cached)
+
+    articles = parse_search_results(html, max_articles=None)
+    if cache:
+        cache.put_derived(url, variant, digest, json.dumps(articles))
+    return articles
+
+def iter_techcrunch_articles(search_term="technology", limit=None, max_pages=MAX_PAGES, prefetch=True):
+    """
+    Lazily yield TechCrunch articles for a search term across result pages
+
+    The next page is only requested once the consumer works through the
+    current one. With prefetch enabled it is fetched one page ahead in a
+    background thread, but only when it will be needed: when limit is set,
+    a page is prefetched once the current page can no longer satisfy it.
+
+    Args:
+        search_term (str): Term to search for
+        limit (int): Stop after this many articles (None for no limit)
+        max_pages (int): Maximum number of result pages to walk
+        prefetch (bool): Fetch the next page in the background
+    """
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    yielded = 0
+    page = 1
+
+    try:
+        articles = fetch_search_page(search_term, page)
+        while articles:
+            next_page = None
+            for index, article in enumerate(articles):
+                remaining_on_page = len(articles) - index
+                wants_more = limit is None or limit - yielded > remaining_on_page
+                if (executor and next_page is None and page < max_pages and wants_more
+                        and (limit is not None or index >= len(articles) // 2)):
+                    next_page = executor.submit(fetch_search_page, search_term, page + 1)
+
+                yield article
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+
+            page += 1
+            if page > max_pages:
+                return
+            articles = next_page.result() if next_page else fetch_search_page(search_term, page)
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def scrape_techcrunch(search_term="technology", max_articles=10, raise_errors=False):
     """
     Scrape TechCrunch articles with proper error handling and data extraction
+
+    Results are read lazily across pages, so large max_articles values walk
+    further into the results while small ones only fetch the first page.
+
+    Args:
+        search_term (str): Term to search for
+        max_articles (int): Maximum number of articles to return
+        raise_errors (bool): Re-raise request/parse errors instead of returning []
     """
+    articles = []
     try:
-        url = f"https://techcrunch.com/?s={search_term.replace(' ', '+')}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        articles = []
-        
-        # Find all article containers
-        article_containers = soup.find_all("div", class_="loop-card__content")
-        
-        if not article_containers:
-            # Try alternative selectors
-            article_containers = soup.find_all("article") or soup.find_all("div", class_="post-block")
-        
-        for container in article_containers[:max_articles]:
-            article_data = extract_article_data(container)
-            if article_data["title"] and article_data["title"] != "No Title":
-                articles.append(article_data)
-        
+        for article in islice(iter_techcrunch_articles(search_term, limit=max_articles), max_articles):
+            articles.append(article)
         return articles
 
     except Exception as e:
+        if articles:
+            # Keep what later pages did not spoil
+            print(f"⚠️ Stopped after {len(articles)} articles: {str(e)}")
+            return articles
+        if raise_errors:
+            raise
         print(f"❌ Scraping error: {str(e)}")
         return []
 
-def extract_article_data(container):
+def scrape_new_articles(search_term="technology", max_articles=50, store=None, raise_errors=False):
+    """
+    Scrape only articles published since the term's last scrape
+
+    Pages are walked newest first and paging stops at the first article the
+    term's watermark already knows, so a sweep costs O(new results). If
+    there are more than max_articles new articles, the oldest ones are
+    returned and the rest are left for the next sweep. The watermark is then
+    advanced to the newest article returned. A sweep cut short by an error
+    before reaching the watermark leaves it unchanged, so nothing is skipped.
+
+    Args:
+        search_term (str): Term to search for
+        max_articles (int): Upper bound on new articles returned
+        store (WatermarkStore): Watermark storage (defaults to Postgres)
+        raise_errors (bool): Re-raise request/parse errors instead of returning []
+    """
+    if store is None:
+        store = _watermark_store()
+
+    watermark = None
+    if store is not None:
+        try:
+            watermark = store.get(search_term)
+        except Exception as e:
+            print(f"⚠️ Could not read watermark for '{search_term}': {str(e)}")
+    known_links = set(watermark["recent_links"]) if watermark else set()
+
+    articles = []
+    reached_watermark = not known_links
+    try:
+        # Without a watermark every page up to the limit is needed anyway;
+        # with one, the walk goes past the limit to the watermark, and
+        # prefetching would mostly fetch pages we stop before
+        limit = None if known_links else max_articles
+        for article in iter_techcrunch_articles(search_term, limit=limit, prefetch=not known_links):
+            if article["link"] in known_links:
+                break
+            articles.append(article)
+        reached_watermark = True
+    except Exception as e:
+        if not articles:
+            if raise_errors:
+                raise
+            print(f"❌ Scraping error: {str(e)}")
+            return []
+        print(f"⚠️ Stopped after {len(articles)} new articles: {str(e)}")
+
+    # Newest first: keep the oldest unseen ones so the next sweep picks up the rest
+    if max_articles:
+        articles = articles[-max_articles:]
+
+    if store is not None and not reached_watermark:
+        print(f"⚠️ Keeping the watermark for '{search_term}': the sweep did not reach it")
+    elif store is not None:
+        try:
+            store.advance(search_term, articles, watermark)
+        except Exception as e:
+            print(f"⚠️ Could not update watermark for '{search_term}': {str(e)}")
+    return articles
+
+def _watermark_store():
+    """The Postgres watermark store, or None (with a warning) if it cannot be set up"""
+    try:
+        from watermarks import WatermarkStore
+        return WatermarkStore()
+    except Exception as e:
+        print(f"⚠️ Watermarks unavailable, scraping without them: {str(e)}")
+        return None
+
+def scrape_many(search_terms, max_articles=10, max_workers=MAX_WORKERS, new_only=False, dedup_index=None):
+    """
+    Scrape several search terms concurrently
+
+    Requests share one keep-alive connection pool and are capped per host by
+    PER_HOST_LIMIT. Results are yielded as (search_term, articles, error) in
+    completion order so callers can render partial results; error is None on
+    success and the exception otherwise. With new_only, each term only
+    returns articles newer than its watermark (see scrape_new_articles).
+    With a dedup_index (see dedup_index.DedupIndex), stories already yielded
+    for another term or seen earlier are dropped.
+    """
+    terms = list(dict.fromkeys(search_terms))
+    if not terms:
+        return
+
+    store = _watermark_store() if new_only else None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(terms))) as executor:
+        if new_only:
+            futures = {
+                executor.submit(scrape_new_articles, term, max_articles, store, True): term
+                for term in terms
+            }
+        else:
+            futures = {
+                executor.submit(scrape_techcrunch, term, max_articles, True): term
+                for term in terms
+            }
+        for future in as_completed(futures):
+            term = futures[future]
+            try:
+                articles = future.result()
+            except Exception as e:
+                yield term, [], e
+                continue
+            if dedup_index is not None:
+                articles = dedup_index.filter(articles)
+            yield term, articles, None
+
+def extract_article_data(container, plan=None, figures=None):
     """
     Extract article data from a container element
+
+    Args:
+        container: BeautifulSoup element holding one article card
+        plan (ExtractionPlan): Plan to resolve fields with (defaults to the shared plan)
+        figures (PreviousFigureIndex): Page-level figure index for image-less cards
     """
     article = {
         "title": "No Title",
@@ -54,108 +361,197 @@ def extract_article_data(container):
     }
     
     try:
-        # Extract title - try multiple selectors
-        title_selectors = [
-            "h3.loop-card__title",
-            "h2.loop-card__title", 
-            "h3",
-            "h2",
-            ".post-title",
-            ".entry-title"
-        ]
-        
-        for selector in title_selectors:
-            title_element = container.select_one(selector)
-            if title_element:
-                article["title"] = title_element.get_text(strip=True)
-                break
+        fields, link_element = (plan or EXTRACTION_PLAN).extract(container)
+
+        if fields["title"] is not None:
+            article["title"] = fields["title"].get_text(strip=True)
         
         # Extract link
-        link_element = container.find("a")
         if link_element and "href" in link_element.attrs:
             link = link_element["href"]
             if link.startswith("/"):
-                link = "https://techcrunch.com" + link
+                link = BASE_URL + link
             article["link"] = link
-        
-        # Extract author
-        author_selectors = [
-            "a.loop-card__author",
-            ".author",
-            ".byline",
-            "[class*='author']"
-        ]
-        
-        for selector in author_selectors:
-            author_element = container.select_one(selector)
-            if author_element:
-                article["author"] = author_element.get_text(strip=True)
-                break
-        
-        # Extract date/meta
-        date_selectors = [
-            ".loop-card__meta",
-            ".post-date",
-            ".date",
-            "time",
-            "[class*='date']"
-        ]
-        
-        for selector in date_selectors:
-            date_element = container.select_one(selector)
-            if date_element:
-                article["date"] = date_element.get_text(strip=True)
-                break
-        
-        # Extract image
-        image_selectors = [
-            "figure.loop-card__figure img",
-            "img",
-            ".featured-image img"
-        ]
-        
-        for selector in image_selectors:
-            img_element = container.select_one(selector)
-            if img_element and "src" in img_element.attrs:
-                article["image"] = img_element["src"]
-                break
+
+        if fields["author"] is not None:
+            article["author"] = fields["author"].get_text(strip=True)
+
+        if fields["date"] is not None:
+            article["date"] = fields["date"].get_text(strip=True)
+
+        if fields["image"] is not None:
+            article["image"] = fields["image"]["src"]
         
         # If no image found, try previous sibling
         if not article["image"]:
-            prev_element = container.find_previous("figure", class_="loop-card__figure")
+            if figures is not None:
+                prev_element = figures.get(container)
+            else:
+                prev_element = container.find_previous("figure", class_="loop-card__figure")
             if prev_element:
                 img = prev_element.find("img")
                 if img and "src" in img.attrs:
                     article["image"] = img["src"]
-        
-        # Extract excerpt
-        excerpt_selectors = [
-            ".loop-card__excerpt",
-            ".excerpt",
-            ".post-excerpt",
-            "p"
-        ]
-        
-        for selector in excerpt_selectors:
-            excerpt_element = container.select_one(selector)
-            if excerpt_element:
-                excerpt_text = excerpt_element.get_text(strip=True)
-                if len(excerpt_text) > 20:
-                    article["excerpt"] = excerpt_text[:200] + "..." if len(excerpt_text) > 200 else excerpt_text
-                    break
+
+        if fields["excerpt"] is not None:
+            excerpt_text = fields["excerpt"].get_text(strip=True)
+            article["excerpt"] = excerpt_text[:200] + "..." if len(excerpt_text) > 200 else excerpt_text
     
     except Exception as e:
         pass  # Silent fail for individual articles
     
     return article
 
-def scrape_hackernoon(search_term="AI"):
+def scrape_hackernoon(search_term="AI", max_articles=10, raise_errors=False):
     """
-    Legacy function for backward compatibility
+    Scrape HackerNoon articles for a search term
+
+    HackerNoon renders search client-side, so this reads the tag feed for the
+    term and falls back to the main feed filtered by the term's words.
+    """
+    from feed_scraper import iter_feed_entries
+
+    try:
+        tag = "-".join(search_term.lower().split())
+        try:
+            feed_text = fetch_page(f"{HACKERNOON_URL}/tagged/{tag}/feed")
+            articles = list(iter_feed_entries(feed_text, limit=max_articles))
+        except requests.HTTPError:
+            articles = []
+
+        if not articles:
+            words = search_term.lower().split()
+            feed_text = fetch_page(f"{HACKERNOON_URL}/feed")
+            articles = []
+            for article in iter_feed_entries(feed_text):
+                text = f"{article['title']} {article['excerpt']}".lower()
+                if any(word in text for word in words):
+                    articles.append(article)
+                    if len(articles) >= max_articles:
+                        break
+        return articles
+
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"❌ Scraping error: {str(e)}")
+        return []
+
+class Source:
+    """
+    A pluggable article source
+
+    Args:
+        name (str): Registry key
+        search (callable): search(query, max_articles) -> list of article dicts;
+            should raise on failure
+        label (str): Display name, also written to each article's "source"
+        requests_per_second (float): Optional rate limit for this source
+        timeout (float): Seconds search_sources waits for this source
+        enabled (bool): Whether search_sources uses it by default
+    """
+
+    def __init__(self, name, search, label=None, requests_per_second=None, timeout=20, enabled=True):
+        self.name = name
+        self.search = search
+        self.label = label or name
+        self.limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        self.timeout = timeout
+        self.enabled = enabled
+
+    def fetch(self, query, max_articles=10):
+        if self.limiter:
+            self.limiter.acquire()
+        articles = self.search(query, max_articles)
+        for article in articles:
+            article.setdefault("source", self.label)
+        return articles
+
+SOURCES = {}
+
+def register_source(source):
+    """Add or replace a source in the registry"""
+    SOURCES[source.name] = source
+    return source
+
+def get_sources(names=None):
+    """Return registered sources by name, or every enabled source"""
+    if names is None:
+        return [source for source in SOURCES.values() if source.enabled]
+    return [SOURCES[name] for name in names]
+
+def search_sources(query, max_articles=10, sources=None, dedup_index=None):
     """
-    # For now, just return TechCrunch results
-    # You can implement actual HackerNoon scraping later
-    return scrape_techcrunch(search_term)
+    Search several sources in parallel
+
+    Yields (source_name, articles, error) as each source finishes, so results
+    can be merged and rendered while slower sources are still running. A
+    source that exceeds its timeout yields a TimeoutError and is abandoned
+    without holding up the rest.
+
+    Args:
+        query (str): Search term passed to every source
+        max_articles (int): Maximum articles per source
+        sources (list): Source names to query (defaults to all enabled)
+        dedup_index (DedupIndex): Drops stories already yielded by another source
+    """
+    selected = get_sources(sources)
+    if not selected:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=len(selected))
+    try:
+        started = time.monotonic()
+        futures = {executor.submit(source.fetch, query, max_articles): source for source in selected}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            next_deadline = min(started + futures[f].timeout for f in pending)
+            done, pending = wait(pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                source = futures[future]
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    yield source.name, [], e
+                    continue
+                if dedup_index is not None:
+                    articles = dedup_index.filter(articles)
+                yield source.name, articles, None
+
+            now = time.monotonic()
+            for future in [f for f in pending if started + futures[f].timeout <= now]:
+                pending.discard(future)
+                source = futures[future]
+                yield source.name, [], TimeoutError(f"{source.label} did not respond within {source.timeout}s")
+    finally:
+        # Do not wait for abandoned sources
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _techcrunch_feed(query, max_articles):
+    from feed_scraper import scrape_techcrunch_feed
+    return scrape_techcrunch_feed(query, max_articles, raise_errors=True)
+
+register_source(Source(
+    "techcrunch",
+    lambda query, max_articles: scrape_techcrunch(query, max_articles, raise_errors=True),
+    label="TechCrunch",
+    requests_per_second=2
+))
+register_source(Source(
+    "techcrunch_rss",
+    _techcrunch_feed,
+    label="TechCrunch (RSS)",
+    requests_per_second=2,
+    enabled=False
+))
+register_source(Source(
+    "hackernoon",
+    lambda query, max_articles: scrape_hackernoon(query, max_articles, raise_errors=True),
+    label="HackerNoon",
+    requests_per_second=1
+))
 
 # Test function
 if __name__ == "__main__":
@@ -0,0 +1,367 @@
+"""
+Append-only, compressed store for generated content
+
+Records are JSON lines, each compressed as its own gzip member (or zstd
+frame when the zstandard package is installed and selected) and appended to
+the active segment file under outputs/store. A segment is sealed once it
+reaches SEGMENT_MAX_BYTES and a new one is started. Because members are
+simply concatenated, every segment is also a valid .gz/.zst stream of JSONL
+(zcat works on it). A SQLite index maps each record to (topic, kind,
+timestamp, segment, offset, length) for random access and listing.
+
+Saving under an existing name supersedes the older record; superseded and
+deleted records are dropped by compaction, which also merges small segments.
+
+Usage:
+    python content_store.py list --topic "healthcare"
+    python content_store.py show 42
+    python content_store.py stats
+    python content_store.py compact
+    python content_store.py import outputs
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:  # zstandard missing: gzip is used
+    zstandard = None
+
+DEFAULT_STORE_DIR = os.path.join("outputs", "store")
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+SEGMENT_SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+def resolve_codec(name=None):
+    """Return "zstd" or "gzip"; zstd falls back to gzip when zstandard is not installed"""
+    name = (name or os.getenv("CONTENT_STORE_CODEC", "auto")).lower()
+    if name in ("zstd", "auto") and zstandard is not None:
+        return "zstd"
+    return "gzip"
+
+def _compress(codec, data):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+def _decompress(codec, data):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Segment is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def infer_kind(record):
+    """Classify a record by its fields: blog_package, variations or content"""
+    if "main_content" in record:
+        return "blog_package"
+    if "variations" in record:
+        return "variations"
+    return "content"
+
+class ContentStore:
+    """Segment-based, append-only content store with a SQLite index"""
+
+    def __init__(self, root=None, codec=None, segment_max_bytes=SEGMENT_MAX_BYTES):
+        self.root = root or os.getenv("CONTENT_STORE_DIR", DEFAULT_STORE_DIR)
+        self.codec = resolve_codec(codec)
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode, so BEGIN IMMEDIATE can serialize writers across processes
+        self._conn = sqlite3.connect(os.path.join(self.root, "index.sqlite3"), timeout=60,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS segments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                size INTEGER NOT NULL DEFAULT 0,
+                sealed INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                kind TEXT,
+                topic TEXT,
+                created_at REAL NOT NULL,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                raw_length INTEGER NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS records_topic ON records(topic, created_at);
+            CREATE INDEX IF NOT EXISTS records_kind ON records(kind, created_at);
+            CREATE INDEX IF NOT EXISTS records_name ON records(name);
+        """)
+
+    def _path(self, segment_id, codec):
+        return os.path.join(self.root, f"segment-{segment_id:06d}{SEGMENT_SUFFIXES[codec]}")
+
+    def _new_segment(self, codec):
+        cursor = self._conn.execute("INSERT INTO segments (path, codec) VALUES ('', ?)", (codec,))
+        segment_id = cursor.lastrowid
+        path = self._path(segment_id, codec)
+        self._conn.execute("UPDATE segments SET path = ? WHERE id = ?", (os.path.basename(path), segment_id))
+        return segment_id, path
+
+    def _active_segment(self, codec, incoming):
+        """Return (segment id, path) to append incoming bytes to, sealing a full segment first"""
+        row = self._conn.execute(
+            "SELECT id, path, size FROM segments WHERE sealed = 0 AND codec = ? ORDER BY id DESC LIMIT 1", (codec,)
+        ).fetchone()
+        if row and (row[2] == 0 or row[2] + incoming <= self.segment_max_bytes):
+            return row[0], os.path.join(self.root, row[1])
+        if row:
+            self._conn.execute("UPDATE segments SET sealed = 1 WHERE id = ?", (row[0],))
+        return self._new_segment(codec)
+
+    def _write_blob(self, blob, codec):
+        """Append a compressed blob; returns (segment id, offset). Call inside a write transaction."""
+        segment_id, path = self._active_segment(codec, len(blob))
+        with open(path, "ab") as f:
+            # A crash can leave unindexed bytes at the end; appending after them keeps offsets valid
+            offset = f.tell()
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        self._conn.execute("UPDATE segments SET size = ? WHERE id = ?", (offset + len(blob), segment_id))
+        return segment_id, offset
+
+    def append(self, record, name=None, topic=None, kind=None, created_at=None):
+        """
+        Append a record and return its id
+
+        Args:
+            record (dict): JSON-serializable content
+            name (str): Optional name; an earlier record with the same name is superseded
+            topic (str): Indexed topic (defaults to record["topic"])
+            kind (str): Indexed kind (defaults to infer_kind(record))
+            created_at (float): Unix timestamp (defaults to now)
+        """
+        payload = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        blob = _compress(self.codec, payload)
+        topic = topic if topic is not None else record.get("topic")
+        kind = kind or infer_kind(record)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                segment_id, offset = self._write_blob(blob, self.codec)
+                if name:
+                    self._conn.execute("UPDATE records SET deleted = 1 WHERE name = ? AND deleted = 0", (name,))
+                cursor = self._conn.execute(
+                    "INSERT INTO records (name, kind, topic, created_at, segment, offset, length, raw_length) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, kind, topic, created_at or time.time(), segment_id, offset, len(blob), len(payload))
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.lastrowid
+
+    def _read(self, segment_path, codec, offset, length):
+        with open(os.path.join(self.root, segment_path), "rb") as f:
+            f.seek(offset)
+            return json.loads(_decompress(codec, f.read(length)))
+
+    def _lookup(self, record_id):
+        return self._conn.execute(
+            "SELECT s.path, s.codec, r.offset, r.length FROM records r JOIN segments s ON s.id = r.segment "
+            "WHERE r.id = ? AND r.deleted = 0", (record_id,)
+        ).fetchone()
+
+    def get(self, record_id):
+        """Return the record with this id, or None if missing or deleted"""
+        # The read happens under the lock so compact() cannot remove the segment meanwhile
+        with self._lock:
+            row = self._lookup(record_id)
+            while row:
+                try:
+                    return self._read(*row)
+                except Exception:
+                    # Compaction in another process may have moved the record since the lookup;
+                    # segment ids are never reused, so an unchanged location is a real error
+                    moved = self._lookup(record_id)
+                    if moved == row:
+                        raise
+                    row = moved
+        return None
+
+    def location(self, record_id):
+        """Human-readable location of a record: <segment file>#<id>"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT s.path FROM records r JOIN segments s ON s.id = r.segment WHERE r.id = ?", (record_id,)
+            ).fetchone()
+        return f"{os.path.join(self.root, row[0])}#{record_id}" if row else None
+
+    def find(self, topic=None, kind=None, since=None, until=None, limit=100):
+        """
+        List live records, newest first, from the index only
+
+        topic matches case-insensitively anywhere in the topic; since/until
+        are Unix timestamps. Returns dicts with id, name, kind, topic and
+        created_at; use get() for the content.
+        """
+        clauses, params = ["deleted = 0"], []
+        if topic:
+            clauses.append("topic LIKE ?")
+            params.append(f"%{topic}%")
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, name, kind, topic, created_at FROM records WHERE {' AND '.join(clauses)} "
+                "ORDER BY created_at DESC, id DESC LIMIT ?", params
+            ).fetchall()
+        return [{"id": r[0], "name": r[1], "kind": r[2], "topic": r[3], "created_at": r[4]} for r in rows]
+
+    def delete(self, record_id):
+        """Mark a record deleted; its bytes are reclaimed by compact()"""
+        with self._lock:
+            self._conn.execute("UPDATE records SET deleted = 1 WHERE id = ?", (record_id,))
+
+    def compact(self):
+        """
+        Rewrite live records into fresh segments and drop the old ones
+
+        Deleted and superseded records are discarded and small segments are
+        merged. Records already in the store's codec are copied without
+        recompression. Writers wait while compaction runs.
+
+        Returns:
+            dict: Segment, record and byte counts before and after
+        """
+        with self._lock:
+            before = self._totals()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                old_segments = self._conn.execute("SELECT id, path, codec FROM segments").fetchall()
+                self._conn.execute("UPDATE segments SET sealed = 1")
+                live = self._conn.execute(
+                    "SELECT r.id, s.path, s.codec, r.offset, r.length FROM records r "
+                    "JOIN segments s ON s.id = r.segment WHERE r.deleted = 0 ORDER BY r.id"
+                ).fetchall()
+                for record_id, path, codec, offset, length in live:
+                    with open(os.path.join(self.root, path), "rb") as f:
+                        f.seek(offset)
+                        blob = f.read(length)
+                    if codec != self.codec:
+                        blob = _compress(self.codec, _decompress(codec, blob))
+                    segment_id, new_offset = self._write_blob(blob, self.codec)
+                    self._conn.execute(
+                        "UPDATE records SET segment = ?, offset = ?, length = ? WHERE id = ?",
+                        (segment_id, new_offset, len(blob), record_id)
+                    )
+                self._conn.execute("DELETE FROM records WHERE deleted = 1")
+                self._conn.executemany("DELETE FROM segments WHERE id = ?", [(s[0],) for s in old_segments])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            for _, path, _ in old_segments:
+                try:
+                    os.remove(os.path.join(self.root, path))
+                except OSError:
+                    pass
+            after = self._totals()
+        return {"before": before, "after": after}
+
+    def _totals(self):
+        records, deleted, raw = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(deleted), 0), COALESCE(SUM(raw_length), 0) FROM records"
+        ).fetchone()
+        segments, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM segments").fetchone()
+        return {"records": records, "deleted": deleted, "segments": segments, "bytes": size, "raw_bytes": raw}
+
+    def stats(self):
+        """Record/segment counts, stored bytes and compression ratio"""
+        with self._lock:
+            totals = self._totals()
+        totals["codec"] = self.codec
+        totals["compression_ratio"] = round(totals["raw_bytes"] / totals["bytes"], 2) if totals["bytes"] else 0.0
+        return totals
+
+    def import_directory(self, directory):
+        """Append every *.json file in directory (e.g. old outputs/), named after the file"""
+        imported = 0
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            if not filename.endswith(".json") or not os.path.isfile(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+            if isinstance(record, dict):
+                self.append(record, name=filename, created_at=os.path.getmtime(path))
+                imported += 1
+        return imported
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_content_store():
+    """Return the process-wide content store (CONTENT_STORE_DIR, default outputs/store)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ContentStore()
+        return _store
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and maintain the generated content store")
+    parser.add_argument("--root", default=None, help="Store directory (default: CONTENT_STORE_DIR or outputs/store)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="List stored records, newest first")
+    listing.add_argument("--topic")
+    listing.add_argument("--kind", choices=["content", "variations", "blog_package"])
+    listing.add_argument("--limit", type=int, default=20)
+    show = commands.add_parser("show", help="Print one record as JSON")
+    show.add_argument("id", type=int)
+    commands.add_parser("stats", help="Show store size and compression")
+    commands.add_parser("compact", help="Drop deleted/superseded records and merge segments")
+    importer = commands.add_parser("import", help="Import *.json files from a directory")
+    importer.add_argument("directory")
+    args = parser.parse_args()
+
+    store = ContentStore(args.root)
+    if args.command == "list":
+        for row in store.find(topic=args.topic, kind=args.kind, limit=args.limit):
+            created = datetime.fromtimestamp(row["created_at"]).strftime("%Y-%m-%d %H:%M")
+            print(f"{row['id']:>7}  {created}  {row['kind']:<12}  {row['topic'] or ''}")
+    elif args.command == "show":
+        record = store.get(args.id)
+        if record is None:
+            print(f"❌ No record {args.id}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(record, indent=2, ensure_ascii=False))
+    elif args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+    elif args.command == "compact":
+        result = store.compact()
+        print(f"Segments: {result['before']['segments']} -> {result['after']['segments']}")
+        print(f"Records: {result['before']['records']} -> {result['after']['records']}")
+        print(f"Bytes: {result['before']['bytes']} -> {result['after']['bytes']}")
+    elif args.command == "import":
+        print(f"Imported {store.import_directory(args.directory)} files")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "dedup_index.sqlite3")
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src",
+    "guccounter", "guce_referrer", "guce_referrer_sig", "tpcc", "cmpid", "_ga", "igshid"
+}
+
+# SimHash distance (in bits) at or below which two articles count as the same story
+SIMHASH_DISTANCE = 3
+# Bands for the SimHash lookup table; with 4 bands of 16 bits any pair within
+# 3 bits shares at least one band exactly
+SIMHASH_BANDS = 4
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+def canonicalize_url(url):
+    """
+    Normalize an article URL so variants of the same link compare equal
+
+    Lowercases scheme and host, drops "www.", default ports, fragments,
+    tracking parameters and trailing slashes, and sorts the remaining query.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, urlencode(query), ""))
+
+def url_hash(url):
+    """Stable 64-bit hash of the canonical form of url"""
+    return _hash64(canonicalize_url(url))
+
+def _article_key(article):
+    """
+    Return (key, by_url) for an article
+
+    Only http(s) links identify an article; for empty or placeholder links
+    ("#") the key is derived from title and excerpt and URL matching is
+    skipped, leaving duplicates to the SimHash check.
+    """
+    link = article.get("link") or ""
+    if urlsplit(link.strip()).scheme.lower() in ("http", "https"):
+        return url_hash(link), True
+    return _hash64(f"no-link:{article.get('title', '')}\n{article.get('excerpt', '')}"), False
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+# Each byte value spread into eight 16-bit lanes, one lane per bit, so bit
+# counts for many hashes can be summed with plain integer addition
+_LANE_BITS = 16
+_SPREAD = [
+    sum(1 << (bit * _LANE_BITS) for bit in range(8) if byte >> bit & 1)
+    for byte in range(256)
+]
+
+def simhash(text):
+    """64-bit SimHash over word unigrams and bigrams of text"""
+    words = _WORD_RE.findall(text.lower())
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    lanes = 0
+    byte_shift = 8 * _LANE_BITS
+    for feature in features[:(1 << _LANE_BITS) - 1]:
+        for i, byte in enumerate(_hash64(feature).to_bytes(8, "little")):
+            lanes += _SPREAD[byte] << (i * byte_shift)
+    threshold = len(features) / 2
+    mask = (1 << _LANE_BITS) - 1
+    value = 0
+    for bit in range(64):
+        if (lanes >> (bit * _LANE_BITS) & mask) > threshold:
+            value |= 1 << bit
+    return value
+
+def article_fingerprint(article):
+    """SimHash of an article's title and excerpt"""
+    return simhash(f"{article.get('title', '')} {article.get('excerpt', '')}")
+
+def _bands(value):
+    width = 64 // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [(i, value >> (i * width) & mask) for i in range(SIMHASH_BANDS)]
+
+def _to_signed(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def _to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+class DedupIndex:
+    """
+    Exact and near-duplicate index for scraped articles
+
+    Articles are matched on the hash of their canonical http(s) URL, then on the
+    SimHash of title and excerpt via a banded lookup table, so a lookup is a
+    few dict probes. The index lives in memory; when persistent it is loaded
+    from and appended to a SQLite file so it survives restarts.
+    """
+
+    def __init__(self, path=None, persistent=True, distance=SIMHASH_DISTANCE):
+        self.distance = distance
+        self._urls = {}
+        self._simhashes = {}
+        self._bands = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if persistent:
+            self.path = path or os.getenv("DEDUP_INDEX_PATH", DEFAULT_INDEX_PATH)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    url_hash INTEGER PRIMARY KEY,
+                    simhash INTEGER NOT NULL,
+                    link TEXT NOT NULL,
+                    title TEXT,
+                    added_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+            for key, fingerprint, link in self._conn.execute("SELECT url_hash, simhash, link FROM articles"):
+                self._remember(_to_unsigned(key), _to_unsigned(fingerprint), link)
+
+    def __len__(self):
+        return len(self._urls)
+
+    def _remember(self, key, fingerprint, link):
+        self._urls[key] = link
+        self._simhashes[key] = fingerprint
+        for band in _bands(fingerprint):
+            self._bands.setdefault(band, []).append(key)
+
+    def _find(self, key, fingerprint, by_url=True):
+        if by_url and key in self._urls:
+            return "url", self._urls[key]
+        if fingerprint:
+            for band in _bands(fingerprint):
+                for other in self._bands.get(band, ()):
+                    if bin(fingerprint ^ self._simhashes[other]).count("1") <= self.distance:
+                        return "similar", self._urls[other]
+        return None
+
+    def check(self, article):
+        """
+        Return ("url" | "similar", matching_link) if article duplicates an
+        indexed one, else None
+        """
+        key, by_url = _article_key(article)
+        with self._lock:
+            return self._find(key, article_fingerprint(article), by_url)
+
+    def add(self, article):
+        """
+        Index an article unless it is a duplicate
+
+        Returns True if the article was new.
+        """
+        with self._lock:
+            added = self._add(article)
+            if added and self._conn is not None:
+                self._conn.commit()
+        return added
+
+    def filter(self, articles):
+        """Return the articles that are not duplicates, indexing them as they pass"""
+        with self._lock:
+            unique = [article for article in articles if self._add(article)]
+            if unique and self._conn is not None:
+                self._conn.commit()
+        return unique
+
+    def _add(self, article):
+        link = article.get("link") or ""
+        key, by_url = _article_key(article)
+        fingerprint = article_fingerprint(article)
+        if self._find(key, fingerprint, by_url):
+            return False
+        self._remember(key, fingerprint, link)
+        if self._conn is not None:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO articles (url_hash, simhash, link, title, added_at) VALUES (?, ?, ?, ?, ?)",
+                (_to_signed(key), _to_signed(fingerprint), link, article.get("title"), time.time())
+            )
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+            self._simhashes.clear()
+            self._bands.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM articles")
+                self._conn.commit()
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_dedup_index():
+    """Return the process-wide persistent dedup index"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DedupIndex()
+        return _index
@@ -0,0 +1,256 @@
+import os
+import re
+import threading
+import importlib.util
+from collections import Counter
+
+from bs4 import Tag
+
+# Parser backends understood by BeautifulSoup, fastest first
+PARSER_BACKENDS = ["lxml", "html.parser", "html5lib"]
+
+# Fallback chains for each field, in priority order
+DEFAULT_SELECTORS = {
+    "title": [
+        "h3.loop-card__title",
+        "h2.loop-card__title",
+        "h3",
+        "h2",
+        ".post-title",
+        ".entry-title"
+    ],
+    "author": [
+        "a.loop-card__author",
+        ".author",
+        ".byline",
+        "[class*='author']"
+    ],
+    "date": [
+        ".loop-card__meta",
+        ".post-date",
+        ".date",
+        "time",
+        "[class*='date']"
+    ],
+    "image": [
+        "figure.loop-card__figure img",
+        "img",
+        ".featured-image img"
+    ],
+    "excerpt": [
+        ".loop-card__excerpt",
+        ".excerpt",
+        ".post-excerpt",
+        "p"
+    ]
+}
+
+_COMPOUND_RE = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?"
+    r"(?P<classes>(?:\.[\w-]+)*)"
+    r"(?:\[(?P<attr>[\w-]+)\*=['\"](?P<value>[^'\"]+)['\"]\])?$"
+)
+
+def resolve_parser_backend(backend=None):
+    """
+    Resolve a parser backend name, falling back to html.parser when the
+    requested one is not installed. "auto" picks the fastest available.
+    """
+    backend = backend or os.getenv("SCRAPER_PARSER", "auto")
+    if backend == "auto":
+        candidates = PARSER_BACKENDS
+    else:
+        candidates = [backend, "html.parser"]
+    for name in candidates:
+        if name == "html.parser" or importlib.util.find_spec(name) is not None:
+            return name
+    return "html.parser"
+
+class CompiledSelector:
+    """
+    A precompiled simple CSS selector
+
+    Supports the subset used by the extraction chains: tag names, classes,
+    [attr*='value'] and the descendant combinator. Matching an element is a
+    few attribute lookups instead of a soupsieve query per container.
+    """
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.parts = [self._compile(part) for part in selector.split()]
+
+    @staticmethod
+    def _compile(part):
+        match = _COMPOUND_RE.match(part)
+        if not match:
+            raise ValueError(f"Unsupported selector: {part}")
+        classes = [c for c in match.group("classes").split(".") if c]
+        return (match.group("tag"), classes, match.group("attr"), match.group("value"))
+
+    @staticmethod
+    def _match_part(part, element):
+        tag, classes, attr, value = part
+        if tag and element.name != tag:
+            return False
+        if classes:
+            element_classes = element.get("class") or []
+            for cls in classes:
+                if cls not in element_classes:
+                    return False
+        if attr:
+            attr_value = element.get(attr)
+            if attr_value is None:
+                return False
+            if isinstance(attr_value, list):
+                attr_value = " ".join(attr_value)
+            if value not in attr_value:
+                return False
+        return True
+
+    def matches(self, element):
+        if not self._match_part(self.parts[-1], element):
+            return False
+        # Remaining parts must match ancestors, nearest first
+        remaining = len(self.parts) - 2
+        if remaining < 0:
+            return True
+        for ancestor in element.parents:
+            if ancestor.name == "[document]":
+                break
+            if self._match_part(self.parts[remaining], ancestor):
+                remaining -= 1
+                if remaining < 0:
+                    return True
+        return False
+
+def _accepts(field, element):
+    """Whether the first match of a selector is usable for a field"""
+    if field == "image":
+        return "src" in element.attrs
+    if field == "excerpt":
+        return len(element.get_text(strip=True)) > 20
+    return True
+
+class ExtractionPlan:
+    """
+    Resolves every article field in a single pass over a container
+
+    Each element is checked once against the compiled fallback chains, and
+    the scan stops as soon as every field has settled on its highest-priority
+    usable match. Once a field has a usable match, lower-priority selectors
+    are no longer checked. The plan counts which selector resolved each field.
+    """
+
+    def __init__(self, selectors=None):
+        selectors = selectors or DEFAULT_SELECTORS
+        self.chains = {field: [CompiledSelector(s) for s in chain] for field, chain in selectors.items()}
+        self.hits = {field: Counter() for field in self.chains}
+        self.containers = 0
+        self.pages = 0
+        self.parse_ms_total = 0.0
+        self.last_parse_ms = 0.0
+        self.last_backend = None
+        self._lock = threading.Lock()
+
+    def extract(self, container):
+        """
+        Return (fields, link_element) for a container
+
+        fields maps each field name to its winning element (or None).
+        """
+        chains = self.chains
+        # found[field][i] is the first element matching chains[field][i];
+        # best[field] is the priority of the best usable match so far
+        found = {field: [None] * len(chain) for field, chain in chains.items()}
+        best = {field: len(chain) for field, chain in chains.items()}
+        pending = set(chains)
+        link_element = None
+
+        for element in container.descendants:
+            if not isinstance(element, Tag):
+                continue
+            if link_element is None and element.name == "a":
+                link_element = element
+            for field in list(pending):
+                field_found = found[field]
+                chain = chains[field]
+                for i in range(best[field]):
+                    if field_found[i] is None and chain[i].matches(element):
+                        field_found[i] = element
+                        if _accepts(field, element):
+                            best[field] = i
+                            break
+                # Settled once every higher-priority selector has had its first match
+                if all(field_found[i] is not None for i in range(best[field])):
+                    pending.discard(field)
+            if not pending and link_element is not None:
+                break
+
+        fields = {}
+        winners = {}
+        for field, chain in chains.items():
+            fields[field] = None
+            if best[field] < len(chain):
+                fields[field] = found[field][best[field]]
+                winners[field] = chain[best[field]].selector
+
+        self._record(winners)
+        return fields, link_element
+
+    def _record(self, winners):
+        with self._lock:
+            for field, selector in winners.items():
+                self.hits[field][selector] += 1
+            self.containers += 1
+
+    def record_parse(self, backend, elapsed_ms):
+        with self._lock:
+            self.pages += 1
+            self.parse_ms_total += elapsed_ms
+            self.last_parse_ms = elapsed_ms
+            self.last_backend = backend
+
+    def stats(self):
+        """Parse timings and per-field selector hit counts"""
+        with self._lock:
+            return {
+                "backend": self.last_backend,
+                "pages": self.pages,
+                "containers": self.containers,
+                "last_parse_ms": round(self.last_parse_ms, 2),
+                "avg_parse_ms": round(self.parse_ms_total / self.pages, 2) if self.pages else 0.0,
+                "selector_hits": {field: dict(hits.most_common()) for field, hits in self.hits.items()},
+            }
+
+class PreviousFigureIndex:
+    """
+    Maps containers to the nearest preceding loop-card figure
+
+    Built lazily with one forward pass over the document, replacing a
+    backwards find_previous walk for every image-less card.
+    """
+
+    def __init__(self, soup, containers):
+        self.soup = soup
+        self.container_ids = {id(c) for c in containers}
+        self._figures = None
+
+    def _build(self):
+        figures = {}
+        last_figure = None
+
+        def wanted(tag):
+            return (tag.name == "figure" and "loop-card__figure" in (tag.get("class") or [])) \
+                or id(tag) in self.container_ids
+
+        for tag in self.soup.find_all(wanted):
+            if id(tag) in self.container_ids:
+                figures[id(tag)] = last_figure
+            if tag.name == "figure" and "loop-card__figure" in (tag.get("class") or []):
+                last_figure = tag
+        self._figures = figures
+
+    def get(self, container):
+        if self._figures is None:
+            self._build()
+        return self._figures.get(id(container))
@@ -0,0 +1,168 @@
+import re
+import html
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from datetime import datetime
+
+import content_scraper
+from content_scraper import fetch_page
+
+# Feed text is handed to the XML parser in chunks of this many characters,
+# so parsing stops as soon as enough entries have been read
+PARSE_CHUNK_SIZE = 16 * 1024
+
+# Dashboard categories that have a dedicated TechCrunch category feed
+CATEGORY_FEEDS = {
+    "AI & Machine Learning": "artificial-intelligence",
+    "Startups & Funding": "startups",
+    "Mobile Technology": "apps",
+    "Cybersecurity": "security",
+    "Space Technology": "space",
+    "Health Tech": "health",
+}
+
+_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "media": "http://search.yahoo.com/mrss/",
+    "content": "http://purl.org/rss/1.0/modules/content/",
+}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_IMG_RE = re.compile(r"<img[^>]+src=[\"']([^\"']+)[\"']", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+def feed_url(category=None, search_term=None):
+    """
+    Build a TechCrunch feed URL
+
+    A category slug gives that category's feed, a search term gives the
+    WordPress search feed, and neither gives the main feed.
+    """
+    base = content_scraper.BASE_URL
+    if category:
+        return f"{base}/category/{category}/feed/"
+    if search_term:
+        return f"{base}/?s={search_term.replace(' ', '+')}&feed=rss2"
+    return f"{base}/feed/"
+
+def _text(element, path):
+    found = element.find(path, _NS)
+    if found is None or found.text is None:
+        return ""
+    return found.text.strip()
+
+def _strip_html(markup):
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", markup))).strip()
+
+def _format_date(value):
+    if not value:
+        return ""
+    try:
+        if value[:4].isdigit():
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        else:
+            parsed = parsedate_to_datetime(value)
+        return parsed.strftime("%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return value
+
+def _image(element, markup):
+    for path in ("media:thumbnail", "media:content"):
+        media = element.find(path, _NS)
+        if media is not None and media.get("url"):
+            return media.get("url")
+    enclosure = element.find("enclosure")
+    if enclosure is not None and enclosure.get("type", "").startswith("image") and enclosure.get("url"):
+        return enclosure.get("url")
+    match = _IMG_RE.search(markup)
+    return match.group(1) if match else ""
+
+def _excerpt(text):
+    if len(text) <= 20:
+        return ""
+    return text[:200] + "..." if len(text) > 200 else text
+
+def parse_rss_item(item):
+    """Map an RSS <item> to the scraper's article schema"""
+    description = _text(item, "description")
+    encoded = _text(item, "content:encoded")
+    return {
+        "title": _strip_html(_text(item, "title")) or "No Title",
+        "link": _text(item, "link") or "#",
+        "author": _text(item, "dc:creator") or _text(item, "author"),
+        "date": _format_date(_text(item, "pubDate")),
+        "image": _image(item, description + encoded),
+        "excerpt": _excerpt(_strip_html(description or encoded)),
+    }
+
+def parse_atom_entry(entry):
+    """Map an Atom <entry> to the scraper's article schema"""
+    link = "#"
+    for candidate in entry.findall("atom:link", _NS):
+        if candidate.get("rel", "alternate") == "alternate" and candidate.get("href"):
+            link = candidate.get("href")
+            break
+    summary = _text(entry, "atom:summary") or _text(entry, "atom:content")
+    return {
+        "title": _strip_html(_text(entry, "atom:title")) or "No Title",
+        "link": link,
+        "author": _text(entry, "atom:author/atom:name"),
+        "date": _format_date(_text(entry, "atom:published") or _text(entry, "atom:updated")),
+        "image": _image(entry, summary),
+        "excerpt": _excerpt(_strip_html(summary)),
+    }
+
+def iter_feed_entries(feed_text, limit=None):
+    """
+    Incrementally parse RSS or Atom text, yielding article dicts
+
+    The text is fed to an XMLPullParser in chunks and finished entries are
+    cleared as they are yielded, so parsing stops once limit is reached.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    rss_item = "item"
+    atom_entry = f"{{{_NS['atom']}}}entry"
+    yielded = 0
+
+    for start in range(0, len(feed_text), PARSE_CHUNK_SIZE):
+        parser.feed(feed_text[start:start + PARSE_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if element.tag == rss_item:
+                article = parse_rss_item(element)
+            elif element.tag == atom_entry:
+                article = parse_atom_entry(element)
+            else:
+                continue
+            element.clear()
+            if article["title"] == "No Title":
+                continue
+            yield article
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+    parser.close()
+
+def scrape_techcrunch_feed(search_term=None, max_articles=10, category=None, raise_errors=False):
+    """
+    Read TechCrunch articles from its RSS feeds instead of the HTML search page
+
+    Feeds are fetched with conditional GET through the scraper's HTTP cache
+    and return the same title/link/author/date/image/excerpt schema as
+    scrape_techcrunch.
+
+    Args:
+        search_term (str): Search feed to read when no category is given
+        max_articles (int): Maximum number of articles to return
+        category (str): TechCrunch category slug, e.g. "startups"
+        raise_errors (bool): Re-raise request/parse errors instead of returning []
+    """
+    try:
+        feed_text = fetch_page(feed_url(category, search_term))
+        return list(iter_feed_entries(feed_text, limit=max_articles))
+
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"❌ Feed error: {str(e)}")
+        return []
@@ -0,0 +1,169 @@
+import os
+import sqlite3
+import threading
+import time
+import hashlib
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http_cache.sqlite3")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+class HTTPCache:
+    """
+    Persistent HTTP response cache backed by SQLite
+
+    Stores response bodies with their ETag/Last-Modified validators so callers
+    can revalidate with conditional requests. Entries are evicted least
+    recently used first once the stored bodies exceed max_bytes. The database
+    runs in WAL mode so several processes can share one cache file.
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or os.getenv("SCRAPER_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes or int(os.getenv("SCRAPER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at);
+            CREATE TABLE IF NOT EXISTS derived (
+                url TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (url, variant)
+            );
+        """)
+        self._conn.commit()
+
+    def get(self, url):
+        """Return the cached entry for url as a dict, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, digest, fetched_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "body": row[2],
+            "digest": row[3],
+            "fetched_at": row[4],
+        }
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match/If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Store a response body and its validators, evicting old entries if needed"""
+        now = time.time()
+        digest = body_digest(body)
+        size = len(body.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (url, etag, last_modified, body, digest, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, etag, last_modified, body, digest, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+        return digest
+
+    def touch(self, url):
+        """Mark a cached entry as freshly validated"""
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._conn.commit()
+
+    def get_derived(self, url, variant, digest):
+        """Return data derived from a response body if the body is unchanged"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM derived WHERE url = ? AND variant = ? AND digest = ?",
+                (url, variant, digest)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_derived(self, url, variant, digest, data):
+        """Store data derived from a response body, e.g. parsed articles"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO derived (url, variant, digest, data) VALUES (?, ?, ?, ?)",
+                (url, variant, digest, data)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM derived")
+            self._conn.commit()
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until we are back under 90% of the cap
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC").fetchall()
+        evicted = []
+        for url, size in rows:
+            if total <= target:
+                break
+            evicted.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        self._conn.executemany("DELETE FROM derived WHERE url = ?", evicted)
+
+def body_digest(body):
+    """Content hash used to detect unchanged bodies"""
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_http_cache():
+    """
+    Return the process-wide HTTP cache, or None if disabled via SCRAPER_CACHE=0
+    """
+    global _cache
+    if os.getenv("SCRAPER_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache()
+        return _cache
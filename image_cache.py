@@ -0,0 +1,190 @@
+import io
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow missing: originals are cached without resizing
+    Image = None
+
+from content_scraper import get_session
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "thumbnails")
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+THUMBNAIL_SIZE = (480, 270)
+# Source images larger than this are not downloaded
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+# Failed downloads are not retried until this many seconds have passed
+RETRY_FAILED_AFTER = 3600
+MAX_WORKERS = 8
+
+class ThumbnailCache:
+    """
+    Local, content-addressed thumbnail store for remote article images
+
+    Images are downloaded once, downscaled to THUMBNAIL_SIZE and written to
+    disk under the SHA-256 of the thumbnail bytes, so identical images share
+    one file. A SQLite index maps image URLs to files and tracks last access
+    for LRU eviction once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, size=THUMBNAIL_SIZE):
+        self.cache_dir = cache_dir or os.getenv("THUMBNAIL_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes or int(os.getenv("THUMBNAIL_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.size = size
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS images (
+                url TEXT PRIMARY KEY,
+                digest TEXT,
+                size INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS images_accessed_at ON images(accessed_at);
+        """)
+        self._conn.commit()
+
+    def _path(self, digest):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.jpg")
+
+    def _lookup(self, url):
+        """Return (path, known) for url; path is None for missing or failed entries"""
+        row = self._conn.execute("SELECT digest, fetched_at FROM images WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None, False
+        digest, fetched_at = row
+        if digest is None:
+            # Remember failures for a while instead of retrying every render
+            return None, time.time() - fetched_at < RETRY_FAILED_AFTER
+        path = self._path(digest)
+        if not os.path.exists(path):
+            return None, False
+        self._conn.execute("UPDATE images SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        return path, True
+
+    def get(self, url):
+        """Return the local thumbnail path for url if cached, without fetching"""
+        with self._lock:
+            path, _ = self._lookup(url)
+            self._conn.commit()
+        return path
+
+    def _download(self, url):
+        response = get_session().get(url, stream=True, timeout=15)
+        try:
+            response.raise_for_status()
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data.extend(chunk)
+                if len(data) > MAX_IMAGE_BYTES:
+                    raise ValueError(f"Image larger than {MAX_IMAGE_BYTES} bytes")
+        finally:
+            response.close()
+        return bytes(data)
+
+    def _thumbnail(self, data):
+        if Image is None:
+            return data
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(self.size)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=85, optimize=True)
+        return output.getvalue()
+
+    def _store(self, url, thumbnail):
+        digest = hashlib.sha256(thumbnail).hexdigest() if thumbnail is not None else None
+        if digest:
+            path = self._path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(thumbnail)
+                os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images (url, digest, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (url, digest, len(thumbnail) if thumbnail else 0, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+        return self._path(digest) if digest else None
+
+    def fetch(self, url):
+        """Return a local thumbnail path for url, downloading it if needed"""
+        path = self.get(url)
+        if path:
+            return path
+        try:
+            return self._store(url, self._thumbnail(self._download(url)))
+        except Exception:
+            self._store(url, None)
+            return None
+
+    def thumbnails(self, urls, max_workers=MAX_WORKERS):
+        """
+        Return {url: local path or None} for many image URLs
+
+        Cached and recently failed URLs are answered from the index; the rest
+        are downloaded and resized concurrently.
+        """
+        result = {}
+        missing = []
+        with self._lock:
+            for url in dict.fromkeys(u for u in urls if u):
+                path, known = self._lookup(url)
+                if known:
+                    result[url] = path
+                else:
+                    missing.append(url)
+            self._conn.commit()
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+                for url, path in zip(missing, executor.map(self.fetch, missing)):
+                    result[url] = path
+        return result
+
+    def _evict(self):
+        # Rows sharing a digest share a file, so count each file once
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM images WHERE digest IS NOT NULL)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT digest, MAX(accessed_at) AS last_access, MAX(size) FROM images "
+            "WHERE digest IS NOT NULL GROUP BY digest ORDER BY last_access ASC"
+        ).fetchall()
+        for digest, _, size in rows:
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM images WHERE digest = ?", (digest,))
+            try:
+                os.remove(self._path(digest))
+            except OSError:
+                pass
+            total -= size
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_thumbnail_cache():
+    """Return the process-wide thumbnail cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache()
+        return _cache
@@ -0,0 +1,106 @@
+import json
+import socket
+import urllib.error
+import urllib.request
+
+DEFAULT_GEMINI_MODEL = "gemini-1.5-flash"
+DEFAULT_HTTP_TIMEOUT = 300
+
+# A backend is any object with a model_name attribute and a method
+#     generate_content(prompt, stream=False, generation_config=None)
+# returning a response with .text and .usage_metadata (prompt_token_count,
+# candidates_token_count), or with stream=True an iterable of such chunks.
+# This is the google.generativeai GenerativeModel interface, so ContentGenerator
+# (caching, rate limiting, retries, metrics) works unchanged on any backend.
+
+class BackendHTTPError(Exception):
+    """Error status from an HTTP backend; code is checked by resilience.is_retryable"""
+
+    def __init__(self, code, message):
+        super().__init__(f"HTTP {code}: {message}")
+        self.code = code
+
+class BackendUnavailable(ConnectionError):
+    """The backend could not be reached"""
+
+class Usage:
+    def __init__(self, prompt_token_count=None, candidates_token_count=None):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+class BackendResponse:
+    """A response or stream chunk shaped like a Gemini response"""
+
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+class GeminiBackend:
+    """Google Gemini through google.generativeai"""
+
+    def __init__(self, api_key, model_name=DEFAULT_GEMINI_MODEL):
+        # Imported here so modules that only need the helpers stay light to import
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+
+    @property
+    def model_name(self):
+        return self._model.model_name
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        return self._model.generate_content(prompt, stream=stream, **kwargs)
+
+class HTTPBackend:
+    """
+    A model served over HTTP with a small JSON protocol
+
+    POST {base_url}/v1/generate with {"prompt", "stream", "generation_config"}.
+    The reply is {"text", "usage": {...}}, or for streams one such JSON
+    object per line. Used with benchmarks/fake_llm_server.py to load-test
+    the generator offline.
+    """
+
+    def __init__(self, base_url, model_name="local-stand-in", timeout=DEFAULT_HTTP_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.timeout = timeout
+
+    def _open(self, prompt, stream, generation_config):
+        body = json.dumps({"prompt": prompt, "stream": stream, "generation_config": generation_config})
+        request = urllib.request.Request(
+            f"{self.base_url}/v1/generate",
+            data=body.encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            raise BackendHTTPError(e.code, e.read().decode("utf-8", "replace").strip() or e.reason) from None
+        except urllib.error.URLError as e:
+            if isinstance(e.reason, socket.timeout):
+                raise TimeoutError(f"{self.base_url} timed out") from None
+            raise BackendUnavailable(f"{self.base_url}: {e.reason}") from None
+
+    @staticmethod
+    def _response(data):
+        return BackendResponse(data.get("text", ""), Usage(**data.get("usage") or {}))
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        response = self._open(prompt, stream, generation_config)
+        if not stream:
+            with response:
+                return self._response(json.loads(response.read()))
+
+        def chunks():
+            with response:
+                for line in response:
+                    if line.strip():
+                        data = json.loads(line)
+                        if "error" in data:
+                            raise BackendHTTPError(data.get("code", 500), data["error"])
+                        yield self._response(data)
+        return chunks()
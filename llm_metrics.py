@@ -0,0 +1,231 @@
+import os
+import math
+import time
+import atexit
+import threading
+from datetime import datetime
+
+# USD per million tokens (input, output), prompts up to 128k tokens
+PRICING = {
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-flash-8b": (0.0375, 0.15),
+    "gemini-1.5-pro": (1.25, 5.00),
+}
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 30
+# Unflushed records beyond this are dropped if the database stays unreachable
+MAX_BUFFERED = 5000
+# Histogram bucket growth factor: percentiles are accurate to about 5%
+BUCKET_GROWTH = 1.1
+
+def call_cost(model, prompt_tokens, output_tokens):
+    """Estimated USD cost of a call, or None for unknown models or missing usage"""
+    rates = PRICING.get(model.split("/")[-1])
+    if rates is None or prompt_tokens is None or output_tokens is None:
+        return None
+    return (prompt_tokens * rates[0] + output_tokens * rates[1]) / 1_000_000
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with bounded memory"""
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+
+    def add(self, ms):
+        bucket = int(math.log(max(ms, 1.0), BUCKET_GROWTH))
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+
+    def percentile(self, p):
+        """Approximate p-th percentile in ms (midpoint of the bucket it falls in)"""
+        if not self.total:
+            return None
+        rank = max(1, math.ceil(self.total * p / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return round(BUCKET_GROWTH ** (bucket + 0.5), 1)
+
+class PostgresMetricsStore:
+    """Writes call records to the llm_calls table"""
+
+    def __init__(self, db_url):
+        self.db_url = db_url
+
+    def write(self, records):
+        import psycopg2
+        from psycopg2.extras import execute_values
+
+        conn = psycopg2.connect(self.db_url)
+        try:
+            cur = conn.cursor()
+            execute_values(
+                cur,
+                """
+                INSERT INTO llm_calls (method, content_type, model, latency_ms, queue_ms, ttft_ms,
+                    prompt_tokens, output_tokens, cost_usd, cached, retries, error, created_at)
+                VALUES %s
+                """,
+                [
+                    (r["method"], r["content_type"], r["model"], r["latency_ms"], r["queue_ms"], r["ttft_ms"],
+                     r["prompt_tokens"], r["output_tokens"], r["cost_usd"], r["cached"], r["retries"],
+                     r["error"], r["created_at"])
+                    for r in records
+                ]
+            )
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+class LLMMetrics:
+    """
+    Per-call latency, token and cost metrics for model calls
+
+    Calls are aggregated in memory per (method, content_type) with latency
+    histograms for p50/p95/p99, and buffered for the store, which receives
+    them in batches from a background thread once batch_size records or
+    flush_interval seconds have accumulated.
+    """
+
+    def __init__(self, store=None, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._groups = {}
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self.dropped = 0
+
+    def record(self, method, content_type, model, latency_ms, queue_ms=0.0, ttft_ms=None,
+               prompt_tokens=None, output_tokens=None, cached=False, retries=0, error=None):
+        """Record one model call (cached lookups and failed calls included)"""
+        cost = None if cached else call_cost(model, prompt_tokens, output_tokens)
+        entry = {
+            "method": method,
+            "content_type": content_type,
+            "model": model,
+            "latency_ms": round(latency_ms, 1),
+            "queue_ms": round(queue_ms, 1),
+            "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": cost,
+            "cached": cached,
+            "retries": retries,
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+            "created_at": datetime.now(),
+        }
+
+        with self._lock:
+            group = self._groups.get((method, content_type))
+            if group is None:
+                group = self._groups[(method, content_type)] = {
+                    "calls": 0, "errors": 0, "cached": 0, "retries": 0,
+                    "prompt_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+                    "latency": LatencyHistogram(), "ttft": LatencyHistogram(),
+                }
+            group["calls"] += 1
+            group["retries"] += retries
+            if error is not None:
+                group["errors"] += 1
+            elif cached:
+                group["cached"] += 1
+            else:
+                # Cache hits would skew the API latency percentiles
+                group["latency"].add(latency_ms)
+                if ttft_ms is not None:
+                    group["ttft"].add(ttft_ms)
+            group["prompt_tokens"] += prompt_tokens or 0
+            group["output_tokens"] += output_tokens or 0
+            group["cost_usd"] += cost or 0.0
+
+            if self.store is None:
+                return
+            self._buffer.append(entry)
+            if len(self._buffer) > MAX_BUFFERED:
+                self.dropped += len(self._buffer) - MAX_BUFFERED
+                del self._buffer[:len(self._buffer) - MAX_BUFFERED]
+            due = (len(self._buffer) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due and not self._flush_lock.locked():
+            threading.Thread(target=self.flush, daemon=True).start()
+
+    def flush(self):
+        """Write buffered records to the store; failed batches are kept for the next flush"""
+        if self.store is None:
+            return
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+            if not batch:
+                return
+            try:
+                self.store.write(batch)
+            except Exception as e:
+                print(f"❌ Failed to persist LLM metrics: {str(e)}")
+                with self._lock:
+                    self._buffer[:0] = batch
+
+    def summary(self):
+        """Per (method, content_type) counts, latency percentiles, tokens and cost"""
+        with self._lock:
+            rows = []
+            for (method, content_type), group in sorted(self._groups.items(), key=lambda item: str(item[0])):
+                latency = group["latency"]
+                rows.append({
+                    "method": method,
+                    "content_type": content_type,
+                    "calls": group["calls"],
+                    "errors": group["errors"],
+                    "cached": group["cached"],
+                    "retries": group["retries"],
+                    "p50_ms": latency.percentile(50),
+                    "p95_ms": latency.percentile(95),
+                    "p99_ms": latency.percentile(99),
+                    "ttft_p50_ms": group["ttft"].percentile(50),
+                    "prompt_tokens": group["prompt_tokens"],
+                    "output_tokens": group["output_tokens"],
+                    "cost_usd": round(group["cost_usd"], 6),
+                })
+            return rows
+
+    def reset(self):
+        with self._lock:
+            self._groups.clear()
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_llm_metrics():
+    """
+    Return the process-wide metrics collector, or None if disabled via LLM_METRICS=0
+
+    Records are persisted to Postgres when DATABASE_URL is set; if that store
+    cannot be set up, metrics are kept in memory only.
+    """
+    global _metrics
+    if os.getenv("LLM_METRICS", "1") == "0":
+        return None
+    with _metrics_lock:
+        if _metrics is None:
+            store = None
+            if os.getenv("DATABASE_URL"):
+                try:
+                    from config import get_db_url
+                    store = PostgresMetricsStore(get_db_url())
+                except Exception as e:
+                    # Metrics stay in memory rather than breaking every generator
+                    print(f"❌ LLM metrics database unavailable, keeping metrics in memory: {str(e)}")
+            _metrics = LLMMetrics(
+                store,
+                batch_size=int(os.getenv("LLM_METRICS_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+                flush_interval=float(os.getenv("LLM_METRICS_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)),
+            )
+            atexit.register(_metrics.flush)
+        return _metrics
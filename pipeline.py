@@ -0,0 +1,141 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+_NO_FALLBACK = object()
+
+class Stage:
+    """
+    One step of a pipeline
+
+    Args:
+        name (str): Unique stage name; its result is stored under this key
+        func (callable): func(results) -> value, where results maps the names
+            of finished stages to their values
+        depends_on (list): Names of stages that must finish first
+        timeout (float): Seconds before the stage is abandoned (None for no limit)
+        fallback: Value used when the stage fails or times out; a callable is
+            called with the exception. Without one, dependents are skipped.
+    """
+
+    def __init__(self, name, func, depends_on=(), timeout=None, fallback=_NO_FALLBACK):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.timeout = timeout
+        self.fallback = fallback
+
+    def recover(self, error):
+        if self.fallback is _NO_FALLBACK:
+            raise error
+        return self.fallback(error) if callable(self.fallback) else self.fallback
+
+class PipelineRun:
+    """Outcome of run_pipeline: results, errors and per-stage timings"""
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+        self.fallbacks = []
+        self.elapsed = 0.0
+
+    def ok(self, name):
+        return name in self.results
+
+    def timings_ms(self):
+        return {name: round(seconds * 1000) for name, seconds in self.timings.items()}
+
+def run_pipeline(stages, max_workers=None, on_stage_done=None):
+    """
+    Run a DAG of stages, executing independent stages concurrently
+
+    Stages start as soon as their dependencies have results. A stage that
+    raises or exceeds its timeout uses its fallback if it has one; otherwise
+    it is recorded in errors and its dependents are skipped. Timed-out stages
+    are abandoned rather than waited for.
+
+    Args:
+        stages (list): Stage objects
+        max_workers (int): Thread pool size (defaults to the number of stages)
+        on_stage_done (callable): Called as on_stage_done(name, run) from the
+            calling thread after each stage finishes, falls back or fails
+
+    Returns:
+        PipelineRun
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        for dependency in stage.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+
+    run = PipelineRun()
+    remaining = dict(by_name)
+    running = {}
+    started = {}
+    pipeline_start = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(stages)))
+
+    def finish(stage, value=_NO_FALLBACK, error=None):
+        run.timings[stage.name] = time.perf_counter() - started[stage.name]
+        if error is not None:
+            try:
+                value = stage.recover(error)
+                run.fallbacks.append(stage.name)
+            except Exception as final_error:
+                run.errors[stage.name] = final_error
+        if stage.name not in run.errors:
+            run.results[stage.name] = value
+        if on_stage_done:
+            on_stage_done(stage.name, run)
+
+    try:
+        while remaining or running:
+            # Skip stages whose dependencies failed for good
+            for name, stage in list(remaining.items()):
+                failed = [d for d in stage.depends_on if d in run.errors]
+                if failed:
+                    del remaining[name]
+                    run.errors[name] = RuntimeError(f"Skipped because {', '.join(failed)} failed")
+                    run.timings[name] = 0.0
+                    if on_stage_done:
+                        on_stage_done(name, run)
+
+            # Start every stage whose dependencies are done
+            for name, stage in list(remaining.items()):
+                if all(d in run.results for d in stage.depends_on):
+                    del remaining[name]
+                    started[name] = time.perf_counter()
+                    snapshot = dict(run.results)
+                    running[executor.submit(stage.func, snapshot)] = stage
+
+            if not running:
+                if remaining:
+                    raise ValueError(f"Pipeline has a dependency cycle: {', '.join(remaining)}")
+                break
+
+            deadlines = [
+                started[stage.name] + stage.timeout
+                for stage in running.values() if stage.timeout is not None
+            ]
+            wait_for = max(0, min(deadlines) - time.perf_counter()) if deadlines else None
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    finish(stage, future.result())
+                except Exception as e:
+                    finish(stage, error=e)
+
+            now = time.perf_counter()
+            for future, stage in list(running.items()):
+                if stage.timeout is not None and now - started[stage.name] >= stage.timeout:
+                    running.pop(future)
+                    future.cancel()
+                    finish(stage, error=TimeoutError(f"Stage '{stage.name}' timed out after {stage.timeout}s"))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    run.elapsed = time.perf_counter() - pipeline_start
+    return run
@@ -0,0 +1,113 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount=1):
+        """Take tokens if available right now; returns True on success"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def release(self, amount=1):
+        """Give back tokens taken for a call that did not go ahead"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def acquire(self, amount=1, timeout=None):
+        """
+        Block until `amount` tokens are taken
+
+        Requests larger than the bucket capacity are allowed once the bucket
+        is full, leaving it in debt. Returns False if timeout expires first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    return True
+                wait = (needed - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+class HostRateLimiter:
+    """
+    One token bucket per host, created on first use
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.capacity)
+            return self._buckets[host]
+
+    def acquire(self, url, timeout=None):
+        return self.bucket(url).acquire(1, timeout=timeout)
+
+class QuotaLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter for API quotas
+
+    Each call takes one request token and its estimated token count, blocking
+    until both buckets allow it. Buckets start full, so a burst up to the
+    per-minute quota goes out immediately.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute / 60.0, requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, tokens=0, timeout=None):
+        if self.requests and not self.requests.acquire(1, timeout=timeout):
+            return False
+        if self.tokens and tokens and not self.tokens.acquire(tokens, timeout=timeout):
+            return False
+        return True
+
+    def try_acquire(self, tokens=0):
+        """Take quota for one call only if both buckets allow it right now; returns True on success"""
+        if self.requests and not self.requests.try_acquire(1):
+            return False
+        if self.tokens and tokens and not self.tokens.try_acquire(tokens):
+            if self.requests:
+                self.requests.release(1)
+            return False
+        return True
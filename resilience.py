@@ -0,0 +1,231 @@
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# HTTP statuses worth retrying: rate limited, server errors, timeouts
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+# Exception types (by name, so no client library is imported here) treated as transient
+RETRYABLE_ERRORS = {"ConnectionError", "Timeout", "ReadTimeout", "ConnectTimeout", "TimeoutError",
+                    "ServiceUnavailable", "DeadlineExceeded", "InternalServerError", "ResourceExhausted"}
+
+# Successful latencies kept per call key for the hedging threshold
+HEDGE_WINDOW = 200
+# No hedging until a key has this many samples
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 95
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open"""
+
+def is_retryable(error):
+    """True for transient errors: rate limits, 5xx responses, timeouts and connection failures"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    code = getattr(error, "code", None)
+    try:
+        if code is not None and int(code) in RETRYABLE_STATUS:
+            return True
+    except (TypeError, ValueError):
+        pass
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter
+
+    Args:
+        max_attempts (int): Total attempts, including the first
+        base_delay (float): Upper bound of the first retry delay in seconds
+        max_delay (float): Cap on any single delay
+    """
+
+    def __init__(self, max_attempts=4, base_delay=1.0, max_delay=30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """Seconds to sleep before retry number attempt (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated transient failures
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    raise CircuitOpenError for reset_timeout seconds. Then one trial call is
+    let through (half-open): success closes the circuit, failure reopens it.
+    name identifies the service in the error message.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, name="API"):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go ahead"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if remaining > 0 or self._trial_running:
+                raise CircuitOpenError(f"{self.name} unavailable, retry in {max(remaining, 1):.0f}s")
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release(self):
+        """End a trial call that failed for a non-transient reason, without changing state"""
+        with self._lock:
+            self._trial_running = False
+
+class ResilientCaller:
+    """
+    Runs API calls with retries, a circuit breaker and optional hedging
+
+    With hedging on, a call that has not returned after the recent p95
+    latency for its key gets a duplicate request, and whichever finishes
+    first wins. The duplicate is only sent if before_attempt admits it
+    without waiting, so it never exceeds a rate limit.
+    """
+
+    def __init__(self, retry=None, breaker=None, hedging=False, max_hedge_workers=16):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.hedging = hedging
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_hedge_workers) if hedging else None
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+
+    def hedge_delay(self, key):
+        """Recent p95 latency in seconds for key, or None while there are too few samples"""
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE / 100))]
+
+    def _observe(self, key, seconds):
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=HEDGE_WINDOW)).append(seconds)
+
+    def _attempt(self, func, key, hedge, before_attempt=None):
+        start = time.perf_counter()
+        delay = self.hedge_delay(key) if hedge and self._executor is not None else None
+        if delay is None:
+            result = func()
+            self._observe(key, time.perf_counter() - start)
+            return result
+
+        primary = self._executor.submit(func)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            result = primary.result()
+            self._observe(key, time.perf_counter() - start)
+            return result
+
+        if before_attempt is not None and not before_attempt(blocking=False):
+            # No quota for a duplicate right now: wait for the primary alone
+            with self._lock:
+                self.hedges_skipped += 1
+            result = primary.result()
+            self._observe(key, time.perf_counter() - start)
+            return result
+
+        with self._lock:
+            self.hedges += 1
+        backup = self._executor.submit(func)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    self._observe(key, time.perf_counter() - start)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def call(self, func, key=None, hedge=True, on_retry=None, before_attempt=None):
+        """
+        Call func() with retries on transient errors
+
+        Args:
+            func (callable): The API call; each attempt calls it again
+            key: Groups latencies for the hedging threshold (e.g. the call's tag)
+            hedge (bool): Allow a hedged duplicate request for this call
+            on_retry (callable): Called as on_retry(attempt, error, delay) before each retry
+            before_attempt (callable): Called as before_attempt() before each
+                attempt, outside the timed and hedged part (e.g. waiting for
+                rate-limit quota), so queueing neither skews the hedge
+                threshold nor triggers hedges. A hedged duplicate calls
+                before_attempt(blocking=False) and is skipped if it returns False
+
+        Raises:
+            CircuitOpenError: The API has been failing and the breaker is open
+        """
+        for attempt in range(1, self.retry.max_attempts + 1):
+            self.breaker.before_call()
+            try:
+                if before_attempt:
+                    before_attempt()
+                result = self._attempt(func, key, hedge, before_attempt)
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.release()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.retry.max_attempts:
+                    raise
+                delay = self.retry.delay(attempt)
+                with self._lock:
+                    self.retries += 1
+                if on_retry:
+                    on_retry(attempt, e, delay)
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self):
+        return {
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedges_skipped": self.hedges_skipped,
+            "circuit": self.breaker.state,
+        }
@@ -0,0 +1,36 @@
+CREATE TABLE IF NOT EXISTS automation_logs (
+    id SERIAL PRIMARY KEY,
+    level VARCHAR(16) NOT NULL,
+    message TEXT NOT NULL,
+    module VARCHAR(64),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Newest articles seen per search term, used to stop incremental scrapes early
+CREATE TABLE IF NOT EXISTS scrape_watermarks (
+    search_term TEXT PRIMARY KEY,
+    last_link TEXT NOT NULL,
+    last_date TEXT,
+    recent_links TEXT[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- One row per Gemini call, written in batches by llm_metrics
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id BIGSERIAL PRIMARY KEY,
+    method VARCHAR(64) NOT NULL,
+    content_type VARCHAR(64),
+    model VARCHAR(64) NOT NULL,
+    latency_ms REAL NOT NULL,
+    queue_ms REAL NOT NULL DEFAULT 0,
+    ttft_ms REAL,
+    prompt_tokens INTEGER,
+    output_tokens INTEGER,
+    cost_usd NUMERIC(12, 8),
+    cached BOOLEAN NOT NULL DEFAULT FALSE,
+    retries INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS llm_calls_method_created_at ON llm_calls (method, content_type, created_at);
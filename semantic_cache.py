@@ -0,0 +1,285 @@
+import os
+import re
+import time
+import zlib
+import sqlite3
+import threading
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "semantic_cache.sqlite3")
+# 1024 float32 dimensions x 5000 entries keeps the matrix around 20 MB
+DEFAULT_DIMENSIONS = 1024
+DEFAULT_THRESHOLD = 0.75
+# Share of content words two keys must have in common (Jaccard) to match
+DEFAULT_MIN_WORD_OVERLAP = 0.6
+DEFAULT_CAPACITY = 5000
+DEFAULT_TTL = 7 * 24 * 3600
+
+# Feature weights: whole words carry most of the meaning, character
+# trigrams absorb plurals and small spelling differences
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+TRIGRAM_WEIGHT = 0.3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "the", "of", "in", "on", "for", "to", "with", "about", "at", "by", "from",
+    "is", "are", "how", "what", "why", "vs", "or", "its", "into", "your", "our",
+}
+
+def _normalize_word(word):
+    # Fold simple plurals ("trends" -> "trend") so they share word features
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def _bucket(feature, dimensions):
+    h = zlib.crc32(feature.encode("utf-8"))
+    # Signed hashing: colliding features tend to cancel instead of adding up
+    return h % dimensions, 1.0 if h & 0x80000000 else -1.0
+
+def _words(text):
+    return [_normalize_word(w) for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+def content_words(text):
+    """Set of content words (stopwords removed, plurals folded) in a text"""
+    return frozenset(_words(text))
+
+def word_overlap(first, second):
+    """
+    Jaccard overlap of two content-word sets, or 0.0 if words were swapped
+
+    One key may add words to the other ("AI in healthcare" and "healthcare
+    AI trends"), but if each has a word the other lacks, an entity was
+    replaced ("US stocks" and "UK stocks") and the keys never match.
+    """
+    if first - second and second - first:
+        return 0.0
+    union = first | second
+    return len(first & second) / len(union) if union else 1.0
+
+def vectorize(text, dimensions=DEFAULT_DIMENSIONS):
+    """
+    Hashed n-gram vector for a short text, L2-normalized
+
+    Features are content words, adjacent word pairs (order-insensitive) and
+    character trigrams of each word, hashed into a fixed number of
+    dimensions, so no vocabulary or model download is needed.
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    words = _words(text)
+    features = []
+    for word in words:
+        features.append((f"w:{word}", WORD_WEIGHT))
+        padded = f"<{word}>"
+        features.extend((f"c:{padded[i:i + 3]}", TRIGRAM_WEIGHT) for i in range(len(padded) - 2))
+    for first, second in zip(words, words[1:]):
+        features.append((f"b:{min(first, second)}|{max(first, second)}", BIGRAM_WEIGHT))
+
+    for feature, weight in features:
+        index, sign = _bucket(feature, dimensions)
+        vector[index] += sign * weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class SemanticCache:
+    """
+    Reuses responses for near-duplicate requests
+
+    Keys (e.g. topics) are embedded with vectorize() into rows of a NumPy
+    matrix; a lookup is one matrix-vector product over the rows in the same
+    namespace, and the best match is returned if its cosine similarity
+    reaches threshold and enough of its content words are shared (see
+    word_overlap), so word order, stopwords and plurals may differ and one
+    key may add a word, but "US stocks" never matches "UK stocks". Namespaces keep requests with different settings
+    (model, content type, length, style) apart. Beyond capacity the least
+    recently used entry is replaced. Entries are persisted in SQLite and the
+    matrix is rebuilt from them on startup.
+    """
+
+    def __init__(self, path=None, threshold=None, capacity=None, ttl=None, dimensions=DEFAULT_DIMENSIONS,
+                 min_word_overlap=None):
+        self.path = path or os.getenv("SEMANTIC_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.threshold = threshold or float(os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_THRESHOLD))
+        self.min_word_overlap = min_word_overlap or float(
+            os.getenv("SEMANTIC_CACHE_MIN_WORD_OVERLAP", DEFAULT_MIN_WORD_OVERLAP)
+        )
+        self.capacity = capacity or int(os.getenv("SEMANTIC_CACHE_CAPACITY", DEFAULT_CAPACITY))
+        self.ttl = ttl or int(os.getenv("SEMANTIC_CACHE_TTL", DEFAULT_TTL))
+        self.dimensions = dimensions
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Row i of the matrix belongs to _ids[i]; free rows have id None
+        self._matrix = np.zeros((self.capacity, dimensions), dtype=np.float32)
+        self._namespaces = np.full(self.capacity, -1, dtype=np.int32)
+        self._last_used = np.zeros(self.capacity, dtype=np.float64)
+        self._ids = [None] * self.capacity
+        self._words = [None] * self.capacity
+        self._namespace_ids = {}
+        self._rows = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                UNIQUE (namespace, key)
+            );
+        """)
+        self._conn.execute("DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl,))
+        self._conn.commit()
+        self._load()
+
+    def _namespace_id(self, namespace):
+        if namespace not in self._namespace_ids:
+            self._namespace_ids[namespace] = len(self._namespace_ids)
+        return self._namespace_ids[namespace]
+
+    def _load(self):
+        rows = self._conn.execute(
+            "SELECT id, namespace, key, accessed_at FROM entries ORDER BY accessed_at DESC LIMIT ?",
+            (self.capacity,)
+        ).fetchall()
+        for row, (entry_id, namespace, key, accessed_at) in enumerate(rows):
+            self._place(row, entry_id, namespace, key, accessed_at)
+        if len(rows) == self.capacity:
+            # Drop persisted entries that no longer fit
+            self._conn.execute(
+                "DELETE FROM entries WHERE id NOT IN (SELECT id FROM entries ORDER BY accessed_at DESC LIMIT ?)",
+                (self.capacity,)
+            )
+            self._conn.commit()
+
+    def _place(self, row, entry_id, namespace, key, accessed_at):
+        self._matrix[row] = vectorize(key, self.dimensions)
+        self._namespaces[row] = self._namespace_id(namespace)
+        self._last_used[row] = accessed_at
+        self._ids[row] = entry_id
+        self._words[row] = content_words(key)
+        self._rows[entry_id] = row
+
+    def _free_row(self):
+        """Index of an empty row, evicting the least recently used entry if full"""
+        if len(self._rows) < self.capacity:
+            return self._ids.index(None)
+        row = int(np.argmin(self._last_used))
+        self._conn.execute("DELETE FROM entries WHERE id = ?", (self._ids[row],))
+        del self._rows[self._ids[row]]
+        self._ids[row] = None
+        return row
+
+    def get(self, namespace, key):
+        """
+        Return (response, matched_key, similarity) for the closest cached key
+        in namespace that reaches the threshold and shares enough content
+        words, or None
+        """
+        vector = vectorize(key, self.dimensions)
+        words = content_words(key)
+        with self._lock:
+            namespace_id = self._namespace_ids.get(namespace)
+            if namespace_id is None or not self._rows:
+                self.misses += 1
+                return None
+            scores = self._matrix @ vector
+            scores[self._namespaces != namespace_id] = -1.0
+            candidates = np.flatnonzero(scores >= self.threshold)
+            # Best-scoring candidate whose content words are close enough
+            row = next((int(r) for r in candidates[np.argsort(-scores[candidates])]
+                        if word_overlap(self._words[r], words) >= self.min_word_overlap), None)
+            if row is None:
+                self.misses += 1
+                return None
+            similarity = float(scores[row])
+
+            entry = self._conn.execute(
+                "SELECT key, response, created_at FROM entries WHERE id = ?", (self._ids[row],)
+            ).fetchone()
+            now = time.time()
+            if entry is None or now - entry[2] >= self.ttl:
+                self._conn.execute("DELETE FROM entries WHERE id = ?", (self._ids[row],))
+                self._conn.commit()
+                self._namespaces[row] = -1
+                self._last_used[row] = 0
+                del self._rows[self._ids[row]]
+                self._ids[row] = None
+                self.misses += 1
+                return None
+
+            self._last_used[row] = now
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE id = ?", (now, self._ids[row]))
+            self._conn.commit()
+            self.hits += 1
+            return entry[1], entry[0], similarity
+
+    def put(self, namespace, key, response):
+        """Store a response under key; an existing entry with the same key is replaced"""
+        now = time.time()
+        with self._lock:
+            existing = self._conn.execute(
+                "SELECT id FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if existing and existing[0] in self._rows:
+                self._conn.execute(
+                    "UPDATE entries SET response = ?, created_at = ?, accessed_at = ? WHERE id = ?",
+                    (response, now, now, existing[0])
+                )
+                self._last_used[self._rows[existing[0]]] = now
+                self._conn.commit()
+                return
+            if existing:
+                self._conn.execute("DELETE FROM entries WHERE id = ?", (existing[0],))
+
+            row = self._free_row()
+            cursor = self._conn.execute(
+                "INSERT INTO entries (namespace, key, response, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, response, now, now)
+            )
+            self._conn.commit()
+            self._place(row, cursor.lastrowid, namespace, key, now)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._matrix[:] = 0
+            self._namespaces[:] = -1
+            self._last_used[:] = 0
+            self._ids = [None] * self.capacity
+            self._words = [None] * self.capacity
+            self._rows.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._rows),
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "min_word_overlap": self.min_word_overlap,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_semantic_cache():
+    """Return the process-wide semantic cache, or None unless enabled via SEMANTIC_CACHE=1"""
+    global _cache
+    if os.getenv("SEMANTIC_CACHE", "0") != "1":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache()
+        return _cache
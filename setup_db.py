@@ -1,6 +1,6 @@
 import os
 import psycopg2
-from utils.config import get_db_url
+from config import get_db_url
 
 def run():
     db_url = get_db_url()
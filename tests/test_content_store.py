@@ -0,0 +1,47 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_store import ContentStore
+
+def make_store(tmp_path):
+    store = ContentStore(str(tmp_path), codec="gzip", segment_max_bytes=2000)
+    ids = [store.append({"topic": f"topic {i}", "content": "x" * 300}, name=f"name {i % 5}") for i in range(40)]
+    return store, ids
+
+def test_reads_during_compaction(tmp_path):
+    store, ids = make_store(tmp_path)
+    live = ids[-5:]
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            for record_id in live:
+                try:
+                    assert store.get(record_id)["topic"] == f"topic {record_id - 1}"
+                except Exception as e:
+                    errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(20):
+        store.compact()
+    done.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+def test_record_moved_by_another_process(tmp_path):
+    store, ids = make_store(tmp_path)
+    other = ContentStore(str(tmp_path), codec="gzip")
+    stale = other._lookup(ids[-1])
+    store.compact()
+
+    # The first lookup returns the location from before the other store compacted
+    lookups = [stale]
+    other._lookup = lambda record_id: lookups.pop() if lookups else ContentStore._lookup(other, record_id)
+    assert other.get(ids[-1])["topic"] == f"topic {ids[-1] - 1}"
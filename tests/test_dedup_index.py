@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_index import DedupIndex
+
+def article(title, link, excerpt=""):
+    return {"title": title, "link": link, "excerpt": excerpt}
+
+def test_articles_without_links_are_not_url_duplicates():
+    index = DedupIndex(persistent=False)
+    articles = [
+        article("Startup raises seed round for robotics platform", "#"),
+        article("Chipmaker reports record quarterly revenue", "#"),
+        article("Open source database adds vector search", ""),
+    ]
+    assert len(index.filter(articles)) == 3
+
+def test_articles_without_links_still_dedup_by_content():
+    index = DedupIndex(persistent=False)
+    title = "Startup raises seed round for robotics platform"
+    assert len(index.filter([article(title, "#"), article(title, "")])) == 1
+
+def test_url_variants_are_duplicates():
+    index = DedupIndex(persistent=False)
+    articles = [
+        article("First title", "https://techcrunch.com/2024/01/01/story/"),
+        article("Completely different wording", "http://www.techcrunch.com/2024/01/01/story?utm_source=x"),
+    ]
+    assert len(index.filter(articles)) == 1
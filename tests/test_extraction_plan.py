@@ -0,0 +1,40 @@
+import os
+import sys
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_plan import ExtractionPlan
+
+PROMO = "Sponsored: sign up for our weekly newsletter today"
+EXCERPT = "The startup raised a new funding round to expand its platform"
+
+def card(html):
+    return BeautifulSoup(f"<div class='loop-card'>{html}</div>", "html.parser").div
+
+def fallback_card(i):
+    # Only the lowest-priority excerpt selector ("p") matches
+    return card(f"<h3 class='loop-card__title'>Story {i}</h3><p>Plain paragraph excerpt for story number {i}</p>")
+
+def both_card():
+    return card(
+        f"<h3 class='loop-card__title'>Both</h3><p>{PROMO}</p>"
+        f"<div class='loop-card__excerpt'>{EXCERPT}</div>"
+    )
+
+def test_priority_wins_when_both_selectors_match():
+    fields, _ = ExtractionPlan().extract(both_card())
+    assert fields["excerpt"].get_text(strip=True) == EXCERPT
+
+def test_fallback_used_when_only_it_matches():
+    fields, _ = ExtractionPlan().extract(fallback_card(1))
+    assert fields["excerpt"].get_text(strip=True) == "Plain paragraph excerpt for story number 1"
+
+def test_winners_do_not_depend_on_history():
+    plan = ExtractionPlan()
+    for i in range(50):
+        plan.extract(fallback_card(i))
+    assert plan.stats()["selector_hits"]["excerpt"] == {"p": 50}
+    fields, _ = plan.extract(both_card())
+    assert fields["excerpt"].get_text(strip=True) == EXCERPT
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import content_scraper
+
+class MemoryStore:
+    """WatermarkStore stand-in keeping watermarks in a dict"""
+
+    def __init__(self):
+        self.watermarks = {}
+
+    def get(self, search_term):
+        return self.watermarks.get(search_term)
+
+    def advance(self, search_term, new_articles, previous=None):
+        if not new_articles:
+            return
+        links = [a["link"] for a in new_articles]
+        if previous:
+            links += [l for l in previous["recent_links"] if l not in links]
+        self.watermarks[search_term] = {"last_link": links[0], "recent_links": links[:20]}
+
+@pytest.fixture
+def site(monkeypatch):
+    """Search results newest first; published articles are appended to the front"""
+    feed = {"articles": [], "fail_after": None}
+
+    def iter_articles(search_term, limit=None, prefetch=True):
+        for i, article in enumerate(feed["articles"]):
+            if limit is not None and i >= limit:
+                return
+            if feed["fail_after"] is not None and i >= feed["fail_after"]:
+                raise ConnectionError("page fetch failed")
+            yield article
+
+    def publish(count):
+        start = len(feed["articles"])
+        feed["articles"][:0] = [{"link": f"https://example.com/{start + i}"} for i in reversed(range(count))]
+
+    monkeypatch.setattr(content_scraper, "iter_techcrunch_articles", iter_articles)
+    feed["publish"] = publish
+    return feed
+
+def links(articles):
+    return [int(a["link"].rsplit("/", 1)[1]) for a in articles]
+
+def test_capped_sweeps_return_every_new_article(site):
+    store = MemoryStore()
+    site["publish"](5)
+    assert links(content_scraper.scrape_new_articles("ai", 5, store)) == [4, 3, 2, 1, 0]
+
+    site["publish"](12)
+    seen = []
+    for _ in range(3):
+        seen += links(content_scraper.scrape_new_articles("ai", 5, store))
+    assert sorted(seen) == list(range(5, 17))
+    assert content_scraper.scrape_new_articles("ai", 5, store) == []
+
+def test_failed_sweep_keeps_the_watermark(site):
+    store = MemoryStore()
+    site["publish"](3)
+    content_scraper.scrape_new_articles("ai", 10, store)
+
+    site["publish"](6)
+    site["fail_after"] = 2
+    assert links(content_scraper.scrape_new_articles("ai", 10, store)) == [8, 7]
+    site["fail_after"] = None
+    assert links(content_scraper.scrape_new_articles("ai", 10, store)) == [8, 7, 6, 5, 4, 3]
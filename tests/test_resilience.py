@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import QuotaLimiter
+from resilience import ResilientCaller, HEDGE_MIN_SAMPLES
+
+def run_calls(requests_per_minute):
+    calls = []
+
+    def func():
+        calls.append(time.monotonic())
+        # Fast while the hedge threshold is learned, then slow enough to trigger a hedge
+        time.sleep(0.05 if len(calls) > HEDGE_MIN_SAMPLES else 0.001)
+        return "ok"
+
+    limiter = QuotaLimiter(requests_per_minute)
+
+    def before_attempt(blocking=True):
+        if not blocking:
+            return limiter.try_acquire()
+        limiter.acquire()
+        return True
+
+    caller = ResilientCaller(hedging=True)
+    for _ in range(HEDGE_MIN_SAMPLES + 1):
+        assert caller.call(func, key="test", before_attempt=before_attempt) == "ok"
+    time.sleep(0.1)
+    return calls, caller.stats()
+
+def test_hedge_is_skipped_without_quota():
+    calls, stats = run_calls(HEDGE_MIN_SAMPLES + 1)
+    assert len(calls) == HEDGE_MIN_SAMPLES + 1
+    assert stats["hedges"] == 0 and stats["hedges_skipped"] == 1
+
+def test_hedge_takes_quota():
+    calls, stats = run_calls(HEDGE_MIN_SAMPLES + 2)
+    assert len(calls) == HEDGE_MIN_SAMPLES + 2
+    assert stats["hedges"] == 1
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_cache import SemanticCache
+
+NAMESPACE = "expanded|test|blog|1500|professional"
+
+@pytest.fixture
+def cache(tmp_path):
+    return SemanticCache(path=str(tmp_path / "semantic.sqlite3"), capacity=50)
+
+@pytest.mark.parametrize("cached, query", [
+    ("investing in US stocks", "investing in UK stocks"),
+    ("top 10 python libraries", "top 10 r libraries"),
+    ("impact of AI on jobs in healthcare", "impact of AI on jobs in education"),
+    ("climate change effects on agriculture", "climate change effects on tourism"),
+    ("AI", "AI ethics"),
+])
+def test_different_topics_do_not_match(cache, cached, query):
+    cache.put(NAMESPACE, cached, "cached article")
+    assert cache.get(NAMESPACE, query) is None
+
+@pytest.mark.parametrize("cached, query", [
+    ("AI in healthcare", "healthcare AI"),
+    ("AI in healthcare", "healthcare AI trends"),
+    ("benefits of electric cars", "electric car benefits"),
+    ("the future of remote work", "remote work future"),
+])
+def test_rephrased_topics_match(cache, cached, query):
+    cache.put(NAMESPACE, cached, "cached article")
+    hit = cache.get(NAMESPACE, query)
+    assert hit is not None and hit[0] == "cached article" and hit[1] == cached
+
+def test_namespaces_are_separate(cache):
+    cache.put(NAMESPACE, "AI in healthcare", "cached article")
+    assert cache.get("expanded|test|blog|3000|casual", "AI in healthcare") is None
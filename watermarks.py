@@ -0,0 +1,80 @@
+# Number of newest links remembered per term, so a removed or re-ordered
+# top article does not force a full rescan
+RECENT_LINKS = 20
+
+class WatermarkStore:
+    """
+    Per-search-term scrape watermarks stored in Postgres (scrape_watermarks)
+    """
+
+    def __init__(self, db_url=None):
+        # Imported here so the module loads without a database driver or config
+        import psycopg2
+        from config import get_db_url
+
+        self.db_url = db_url or get_db_url()
+        self._connect = psycopg2.connect
+
+    def get(self, search_term):
+        """Return the watermark for a term as a dict, or None if never scraped"""
+        conn = self._connect(self.db_url)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT last_link, last_date, recent_links, updated_at FROM scrape_watermarks WHERE search_term = %s",
+                (search_term,)
+            )
+            row = cur.fetchone()
+            cur.close()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {
+            "last_link": row[0],
+            "last_date": row[1],
+            "recent_links": list(row[2] or []),
+            "updated_at": row[3]
+        }
+
+    def advance(self, search_term, new_articles, previous=None):
+        """
+        Move a term's watermark to the newest of new_articles
+
+        new_articles must be ordered newest first, as returned by the scraper.
+        """
+        if not new_articles:
+            return
+        links = [a["link"] for a in new_articles]
+        if previous:
+            links += [l for l in previous["recent_links"] if l not in links]
+        conn = self._connect(self.db_url)
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO scrape_watermarks (search_term, last_link, last_date, recent_links, updated_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON CONFLICT (search_term) DO UPDATE SET
+                    last_link = EXCLUDED.last_link,
+                    last_date = EXCLUDED.last_date,
+                    recent_links = EXCLUDED.recent_links,
+                    updated_at = NOW()
+                """,
+                (search_term, new_articles[0]["link"], new_articles[0].get("date"), links[:RECENT_LINKS])
+            )
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+    def reset(self, search_term):
+        """Forget a term's watermark so the next scrape starts from scratch"""
+        conn = self._connect(self.db_url)
+        try:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM scrape_watermarks WHERE search_term = %s", (search_term,))
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()